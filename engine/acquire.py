@@ -0,0 +1,71 @@
+import time
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from engine.config import ACQUIRE_DEADLINE
+
+def _start_daemon(name, fn, *args):
+    """
+    Runs fn(*args) on a daemon thread and returns its Future. Unlike executor workers, a loader
+    still stuck past its deadline can't keep the interpreter alive at exit.
+    """
+    future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=f"acquire-{name}", daemon=True).start()
+    return future
+
+def acquire_all(sources, deadline=ACQUIRE_DEADLINE):
+    """
+    Runs every I/O-bound source concurrently so wall-clock is set by the slowest one.
+
+    sources: { name: { 'load': fn(deadline, **deps), 'timeout': secs,
+                       'needs': [names], 'fallback': fn() } }
+    A source with a fallback degrades to it on error/timeout; a source without one is required
+    and raises. `deadline` is passed to each loader (absolute time.monotonic()) so retry
+    backoff stops once the source's budget is spent. Sources run on daemon threads, so one that
+    hangs past the deadline is abandoned and never blocks process exit.
+    """
+    start = time.monotonic()
+    stage_deadline = start + deadline
+    results = {}
+
+    futures = {}
+
+    def run_source(name, spec, source_deadline):
+        deps = {dep: futures[dep].result(timeout=max(0, source_deadline - time.monotonic())) for dep in spec.get('needs', [])}
+        t0 = time.monotonic()
+        value = spec['load'](source_deadline, **deps)
+        print(f"   ⏱️ {name} ready in {time.monotonic() - t0:.1f}s")
+        return value
+
+    # Start dependencies first so dependents can block on them
+    pending = dict(sources)
+    while pending:
+        ready = [n for n, s in pending.items() if all(d in futures for d in s.get('needs', []))]
+        if not ready:
+            raise ValueError(f"Unresolvable source dependencies: {sorted(pending)}")
+        for name in ready:
+            spec = pending.pop(name)
+            source_deadline = min(stage_deadline, start + spec.get('timeout', deadline))
+            futures[name] = _start_daemon(name, run_source, name, spec, source_deadline)
+
+    for name, spec in sources.items():
+        source_deadline = min(stage_deadline, start + spec.get('timeout', deadline))
+        try:
+            results[name] = futures[name].result(timeout=max(0, source_deadline - time.monotonic()))
+        except Exception as e:
+            reason = "timed out" if isinstance(e, FutureTimeout) else f"failed: {e}"
+            if 'fallback' not in spec:
+                raise RuntimeError(f"Required source '{name}' {reason}") from e
+            print(f"   ⚠️ {name} {reason}. Using fallback.")
+            results[name] = spec['fallback']()
+
+    print(f"   ✅ Data acquisition finished in {time.monotonic() - start:.1f}s")
+    return results
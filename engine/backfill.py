@@ -0,0 +1,76 @@
+import nflreadpy as nfl
+import pandas as pd
+import json
+import os
+from engine.config import CACHE_DIR, BACKFILL_DIR, CURRENT_SEASON
+from engine.data import load_frame_with_retry, build_kick_features, KICK_OTHER
+from engine.pbp_cache import load_pbp_cached
+from engine.drives import load_drive_summary
+from engine.team_stats import build_team_game_table, build_team_share_table
+from engine.features import build_team_week_features, save_feature_store, load_feature_store
+from engine.replay import replay_projections, kicker_week_actuals
+
+# Columns kept in the per-season replay artifact (model inputs, outputs and the actual score)
+BACKFILL_COLUMNS = [
+    'week', 'kicker_player_id', 'kicker_player_name', 'team', 'opponent', 'is_home', 'is_dome',
+    'avg_pts', 'games', 'vegas_implied', 'total_line', 'spread_line',
+    'off_stall_rate', 'def_stall_rate', 'off_ppg', 'def_pa', 'off_share', 'def_share',
+    'lg_off_avg', 'lg_def_avg', 'grade', 'proj', 'act'
+]
+
+def backfill_season(season, cache_dir=CACHE_DIR, out_dir=BACKFILL_DIR):
+    """
+    Full point-in-time pipeline for one season: PBP (shared week-partitioned cache) -> kicks ->
+    drive summary -> team feature store (read back from disk for finished seasons) -> replayed
+    projections for every week, joined to actuals.
+    Regular-season games only. Writes <out_dir>/<season>/replay.parquet and summary.json and returns the summary.
+    """
+    schedule = load_frame_with_retry(lambda: nfl.load_schedules(seasons=[season]), f"Schedule {season}")
+    pbp = load_pbp_cached(season, schedule, cache_dir=cache_dir)
+
+    # Regular season only: playoff games would leak into the trailing team features and the MAE/bias
+    if 'game_type' in schedule.columns:
+        schedule = schedule[schedule['game_type'] == 'REG']
+        pbp = pbp[pbp['game_id'].isin(schedule['game_id'])]
+
+    kicks = build_kick_features(pbp)
+    kick_plays = kicks[kicks['code'] != KICK_OTHER]
+
+    # A finished season's team features never change, so its persisted store is looked up instead of rebuilt
+    team_features = load_feature_store(season, cache_dir=cache_dir) if season < CURRENT_SEASON else None
+    if team_features is None:
+        drives = load_drive_summary(season, pbp, kicks, cache_dir=cache_dir)
+        team_games = build_team_game_table(schedule, schedule['week'].max())
+        team_features = build_team_week_features(team_games, drives, build_team_share_table(team_games, kick_plays))
+        save_feature_store(team_features, season, cache_dir=cache_dir)
+
+    replayed = replay_projections(kick_plays, schedule, team_features, sorted(kick_plays['week'].unique()))
+    replayed = replayed.merge(kicker_week_actuals(kick_plays), on=['week', 'kicker_player_id'], how='left')
+    replayed = replayed[[c for c in BACKFILL_COLUMNS if c in replayed.columns]]
+
+    # Kickers who didn't kick that week (injured, inactive, cut) have no actual and aren't scored
+    scored = replayed[replayed['act'].notna()]
+    error = scored['proj'] - scored['act']
+    summary = {
+        'season': int(season),
+        'weeks': int(scored['week'].nunique()),
+        'rows': int(len(scored)),
+        'mae': round(float(error.abs().mean()), 3) if not scored.empty else None,
+        'bias': round(float(error.mean()), 3) if not scored.empty else None,
+    }
+
+    season_dir = os.path.join(out_dir, str(season))
+    os.makedirs(season_dir, exist_ok=True)
+    replayed.to_parquet(os.path.join(season_dir, "replay.parquet"), index=False)
+    with open(os.path.join(season_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+def load_backfill(seasons, out_dir=BACKFILL_DIR):
+    """Concatenates the replay artifacts of the given seasons (missing ones are skipped)."""
+    frames = []
+    for season in seasons:
+        path = os.path.join(out_dir, str(season), "replay.parquet")
+        if os.path.exists(path):
+            frames.append(pd.read_parquet(path).assign(season=int(season)))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['season'] + BACKFILL_COLUMNS)
@@ -0,0 +1,46 @@
+# --- PBP COLUMN MANIFEST ---
+# nflverse PBP ships ~370 columns; the engine reads a couple dozen.
+# Each module declares what it reads at import time and the loader only keeps the union.
+PBP_COLUMNS = {}
+
+# Compact dtypes for the columns we keep. Anything not listed is left as loaded.
+PBP_DTYPES = {
+    'week': 'int16',
+    'play_id': 'float32',
+    'drive': 'float32',
+    'down': 'float32',
+    'yardline_100': 'float32',
+    'kick_distance': 'float32',
+    'touchdown': 'float32',
+    'interception': 'float32',
+    'fumble_lost': 'float32',
+    'play_type': 'category',
+    'field_goal_result': 'category',
+    'extra_point_result': 'category',
+    'roof': 'category',
+}
+
+def declare_pbp_columns(consumer, columns):
+    """Registers the PBP columns a module reads."""
+    PBP_COLUMNS[consumer] = list(columns)
+
+def required_pbp_columns():
+    """Union of every declared column, in a stable order."""
+    return sorted({c for cols in PBP_COLUMNS.values() for c in cols})
+
+def project_pbp(pbp, columns=None):
+    """
+    Selects only the manifest columns and casts them to compact dtypes.
+    Accepts a polars frame (selected before the pandas conversion) or a pandas frame.
+    """
+    columns = columns or required_pbp_columns()
+    present = [c for c in columns if c in pbp.columns]
+    missing = [c for c in columns if c not in pbp.columns]
+    if missing:
+        print(f"   ⚠️ PBP is missing declared columns: {missing}")
+
+    pbp = pbp.select(present) if hasattr(pbp, "to_pandas") else pbp[present]
+    if hasattr(pbp, "to_pandas"): pbp = pbp.to_pandas()
+
+    casts = {c: t for c, t in PBP_DTYPES.items() if c in pbp.columns and str(pbp[c].dtype) != t}
+    return pbp.astype(casts) if casts else pbp
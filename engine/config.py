@@ -18,4 +18,17 @@ STADIUM_COORDS = {
     'NYJ': (40.8135, -74.0745), 'PHI': (39.9008, -75.1675), 'PIT': (40.4468, -80.0158),
     'SEA': (47.5952, -122.3316), 'SF': (37.4023, -121.9690), 'TB': (27.9759, -82.5033),
     'TEN': (36.1665, -86.7713), 'WAS': (38.9076, -76.8645)
-}
\ No newline at end of file
+}
+
+# --- DATA ACQUISITION ---
+ACQUIRE_DEADLINE = 300 # Seconds. Overall budget for the concurrent load stage
+
+# --- LOCAL CACHE ---
+CACHE_DIR = ".cache" # Persisted between workflow runs via actions/cache
+GAME_TZ = "America/New_York" # Schedule gameday/gametime are Eastern
+PBP_SETTLE_HOURS = 72 # A game is re-merged from every new PBP release until one published this long after kickoff (late plays, stat corrections)
+BACKFILL_DIR = ".cache/backfill" # Per-season replay artifacts written by run_backfill.py
+BACKFILL_MAX_WORKERS = 4 # Default process cap: each worker holds a season of PBP plus the downloaded release (a few hundred MB)
+
+# Forecast TTL shrinks as kickoff approaches: (hours to kickoff above, TTL hours)
+WEATHER_TTL_TIERS = [(72, 12), (24, 6), (3, 2), (-24, 0.25)]
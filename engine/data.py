@@ -7,19 +7,34 @@ import numpy as np
 import re
 from datetime import datetime, timedelta
 from engine.config import CURRENT_SEASON, SEASON_START_DATE, FORCE_WEEK
+from engine.columns import declare_pbp_columns
 
-def load_data_with_retry(func, name, max_retries=5, delay=5):
+declare_pbp_columns('data', [
+    'week', 'game_id', 'play_id', 'drive', 'posteam', 'defteam', 'yardline_100', 'roof',
+    'play_type', 'kick_distance', 'field_goal_result', 'extra_point_result',
+    'kicker_player_id', 'kicker_player_name',
+    'touchdown', 'interception', 'fumble_lost'
+])
+
+def load_data_with_retry(func, name, max_retries=5, delay=5, deadline=None):
     for attempt in range(max_retries):
         try:
             print(f"   📥 Loading {name} (Attempt {attempt + 1}/{max_retries})...")
             return func()
         except Exception as e:
             print(f"   ⚠️ {name} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(delay * (2 ** attempt))
+            wait = delay * (2 ** attempt)
+            # Don't start a backoff we can't finish inside the caller's budget
+            if attempt < max_retries - 1 and (deadline is None or time.monotonic() + wait < deadline):
+                time.sleep(wait)
             else:
                 raise e
 
+def load_frame_with_retry(func, name, deadline=None):
+    """load_data_with_retry for nflreadpy loaders, returning a pandas frame."""
+    df = load_data_with_retry(func, name, deadline=deadline)
+    return df.to_pandas() if hasattr(df, "to_pandas") else df
+
 def get_current_nfl_week():
     """Calculates current week using Calendar Math (Instant)."""
     if FORCE_WEEK is not None:
@@ -35,64 +50,117 @@ def get_current_nfl_week():
     week_num = (days_since_start // 7) + 1
     return max(1, min(18, week_num))
 
-# --- NEW FUNCTION: GET GRANULAR KICKER STATS FOR A SPECIFIC WEEK ---
-def get_kicker_scores_for_week(pbp_data, target_week):
+# --- KICK FEATURE TABLE ---
+# Every kick gets one int8 outcome code (bucket x made), so each aggregation is a single bincount
+# instead of a dozen boolean columns built with `between`.
+DIST_EDGES = np.array([20, 30, 40, 50, 60])
+DIST_BUCKETS = ['0_19', '20_29', '30_39', '40_49', '50_59', '60_plus']
+KICK_CODES = (
+    [f'fg_{b}' for b in DIST_BUCKETS] +          # 0-5   FG made, by distance
+    [f'fg_miss_{b}' for b in DIST_BUCKETS] +     # 6-11  FG missed, by distance
+    ['fg_made_nodist', 'fg_miss_nodist',         # 12-13 FG with no recorded distance
+     'xp_made', 'xp_miss',                       # 14-15
+     'other']                                    # 16    kickoffs etc. (keeps the kicker in the week)
+)
+KICK_OTHER = KICK_CODES.index('other')
+FG_MADE_CODES = list(range(0, 6)) + [12]
+FG_MISS_CODES = list(range(6, 12)) + [13]
+
+# Column order used by the weekly history records
+KICK_COUNT_COLS = (
+    [f'fg_{b}' for b in DIST_BUCKETS] + [f'fg_miss_{b}' for b in DIST_BUCKETS] +
+    ['fg_miss', 'xp_made', 'xp_miss']
+)
+
+def build_kick_features(pbp):
+    """
+    One row per kick: keys (game/week/team/kicker), distance, dome flag and the compact outcome code.
+    Built once per run; season totals, weekly history, live week and L4 shares all aggregate from it.
+    """
+    # Kicks without a kicker id can't be attributed to anyone (the old groupbys dropped them too)
+    kicks = pbp.dropna(subset=['kicker_player_name', 'kicker_player_id'])
+    is_fg = (kicks['play_type'] == 'field_goal').to_numpy(dtype=bool)
+    is_xp = (kicks['play_type'] == 'extra_point').to_numpy(dtype=bool)
+    made = np.where(is_fg, (kicks['field_goal_result'] == 'made').to_numpy(dtype=bool),
+                    (kicks['extra_point_result'] == 'good').to_numpy(dtype=bool))
+
+    dist = kicks['kick_distance'].to_numpy(dtype='float64', na_value=np.nan)
+    has_dist = ~np.isnan(dist)
+    bucket = np.searchsorted(DIST_EDGES, np.where(has_dist, dist, 0), side='right')
+
+    code = np.select(
+        [is_fg & has_dist & made, is_fg & has_dist, is_fg & made, is_fg, is_xp & made, is_xp],
+        [bucket, bucket + 6, 12, 13, 14, 15],
+        default=KICK_OTHER
+    ).astype('int8')
+
+    return pd.DataFrame({
+        'game_id': kicks['game_id'].to_numpy(),
+        'play_id': kicks['play_id'].to_numpy(),
+        'drive': kicks['drive'].to_numpy(),
+        'week': kicks['week'].to_numpy(),
+        'posteam': kicks['posteam'].to_numpy(),
+        'kicker_player_id': kicks['kicker_player_id'].to_numpy(),
+        'kicker_player_name': kicks['kicker_player_name'].to_numpy(),
+        'kick_distance': dist.astype('float32'),
+        'is_dome': kicks['roof'].isin(['dome', 'closed']).to_numpy(),
+        'code': code,
+        'real_pts': np.where(made & is_fg, 3, 0) + np.where(made & is_xp, 1, 0),
+    })
+
+def aggregate_kick_counts(kicks, keys, columns=KICK_COUNT_COLS, prefix=''):
+    """
+    Per-group counts for the requested outcome columns from the kick feature table.
+    One ngroup + bincount over (group x code), no per-bucket passes.
+    """
+    # Rows with a null key belong to no group (ngroup marks them NaN, not -1, on newer pandas)
+    kicks = kicks.dropna(subset=keys)
+    grouped = kicks.groupby(keys, sort=True)
+    gid = grouped.ngroup().to_numpy(dtype='int64')
+    index = grouped.size().index
+    n_codes = len(KICK_CODES)
+
+    flat = np.bincount(gid * n_codes + kicks['code'].to_numpy(), minlength=len(index) * n_codes)
+    matrix = flat.reshape(len(index), n_codes)
+
+    derived = {
+        'fg_made': matrix[:, FG_MADE_CODES].sum(axis=1),
+        'fg_miss': matrix[:, FG_MISS_CODES].sum(axis=1),
+    }
+    derived['fg_att'] = derived['fg_made'] + derived['fg_miss']
+
+    counts = pd.DataFrame(index=index).reset_index()
+    for col in columns:
+        counts[prefix + col] = derived[col] if col in derived else matrix[:, KICK_CODES.index(col)]
+    return counts
+
+def get_kicker_scores_for_week(pbp_data, target_week, kicks=None):
     """
     Calculates granular FG/XP stats for all kickers in a given week.
     Returns a DataFrame with columns for each distance bucket.
+    Pass a prebuilt kick feature table to skip rebuilding it.
     """
-    week_plays = pbp_data[pbp_data['week'] == target_week].copy()
-    week_plays = week_plays.dropna(subset=['kicker_player_name'])
-    
-    if week_plays.empty:
+    if kicks is None:
+        kicks = build_kick_features(pbp_data[pbp_data['week'] == target_week])
+    else:
+        kicks = kicks[kicks['week'] == target_week]
+
+    if kicks.empty:
         return pd.DataFrame()
 
-    # Helper for determining make/miss and distance bucket
-    week_plays['is_fg'] = week_plays['play_type'] == 'field_goal'
-    week_plays['is_xp'] = week_plays['play_type'] == 'extra_point'
-    week_plays['made'] = ((week_plays['is_fg'] & (week_plays['field_goal_result'] == 'made')) | 
-                          (week_plays['is_xp'] & (week_plays['extra_point_result'] == 'good')))
-    
-    # Buckets for MAKES
-    week_plays['fg_0_19'] = (week_plays['is_fg']) & (week_plays['made']) & (week_plays['kick_distance'] < 20)
-    week_plays['fg_20_29'] = (week_plays['is_fg']) & (week_plays['made']) & (week_plays['kick_distance'].between(20, 29))
-    week_plays['fg_30_39'] = (week_plays['is_fg']) & (week_plays['made']) & (week_plays['kick_distance'].between(30, 39))
-    week_plays['fg_40_49'] = (week_plays['is_fg']) & (week_plays['made']) & (week_plays['kick_distance'].between(40, 49))
-    week_plays['fg_50_59'] = (week_plays['is_fg']) & (week_plays['made']) & (week_plays['kick_distance'].between(50, 59))
-    week_plays['fg_60_plus'] = (week_plays['is_fg']) & (week_plays['made']) & (week_plays['kick_distance'] >= 60)
-    
-    # Buckets for MISSES
-    week_plays['fg_miss_0_19'] = (week_plays['is_fg']) & (~week_plays['made']) & (week_plays['kick_distance'] < 20)
-    week_plays['fg_miss_20_29'] = (week_plays['is_fg']) & (~week_plays['made']) & (week_plays['kick_distance'].between(20, 29))
-    week_plays['fg_miss_30_39'] = (week_plays['is_fg']) & (~week_plays['made']) & (week_plays['kick_distance'].between(30, 39))
-    week_plays['fg_miss_40_49'] = (week_plays['is_fg']) & (~week_plays['made']) & (week_plays['kick_distance'].between(40, 49))
-    week_plays['fg_miss_50_59'] = (week_plays['is_fg']) & (~week_plays['made']) & (week_plays['kick_distance'].between(50, 59))
-    week_plays['fg_miss_60_plus'] = (week_plays['is_fg']) & (~week_plays['made']) & (week_plays['kick_distance'] >= 60)
-    
-    # General / Totals
-    week_plays['fg_miss'] = (week_plays['is_fg']) & (~week_plays['made']) 
-    week_plays['xp_made'] = (week_plays['is_xp']) & (week_plays['made'])
-    week_plays['xp_miss'] = (week_plays['is_xp']) & (~week_plays['made'])
-
-    # Aggregate by player
-    stats = week_plays.groupby(['kicker_player_id', 'kicker_player_name']).agg(
-        fg_0_19=('fg_0_19', 'sum'),
-        fg_20_29=('fg_20_29', 'sum'),
-        fg_30_39=('fg_30_39', 'sum'),
-        fg_40_49=('fg_40_49', 'sum'),
-        fg_50_59=('fg_50_59', 'sum'),
-        fg_60_plus=('fg_60_plus', 'sum'),
-        fg_miss_0_19=('fg_miss_0_19', 'sum'),
-        fg_miss_20_29=('fg_miss_20_29', 'sum'),
-        fg_miss_30_39=('fg_miss_30_39', 'sum'),
-        fg_miss_40_49=('fg_miss_40_49', 'sum'),
-        fg_miss_50_59=('fg_miss_50_59', 'sum'),
-        fg_miss_60_plus=('fg_miss_60_plus', 'sum'),
-        fg_miss=('fg_miss', 'sum'),
-        xp_made=('xp_made', 'sum'),
-        xp_miss=('xp_miss', 'sum')
-    ).reset_index()
-    
+    stats = aggregate_kick_counts(kicks, ['kicker_player_id', 'kicker_player_name'])
+    return stats.rename(columns={'kicker_player_id': 'id', 'kicker_player_name': 'name'})
+
+def get_kicker_scores_by_week(kicks, max_week):
+    """
+    Same records as get_kicker_scores_for_week, for every week up to `max_week` in one grouped pass.
+    Returns a long frame keyed by (week, id, name).
+    """
+    kicks = kicks[kicks['week'] <= max_week]
+    if kicks.empty:
+        return pd.DataFrame()
+
+    stats = aggregate_kick_counts(kicks, ['week', 'kicker_player_id', 'kicker_player_name'])
     return stats.rename(columns={'kicker_player_id': 'id', 'kicker_player_name': 'name'})
 
 # --- SCRAPING FUNCTIONS ---
@@ -168,83 +236,98 @@ def clean_nan(val):
         if pd.isna(val) or np.isinf(val): return None
     return val
 
-def calculate_stall_metrics(df_pbp):
-    """Calculates stall rates using VECTORIZED operations for speed."""
-    rz_drives = df_pbp[(df_pbp['yardline_100'] <= 25) & (df_pbp['yardline_100'].notnull())]
-    drives = rz_drives[['game_id', 'drive', 'posteam', 'defteam']].drop_duplicates()
-    
-    if drives.empty:
-        return pd.DataFrame(columns=['posteam', 'off_stall_rate']), pd.DataFrame(columns=['defteam', 'def_stall_rate'])
-
-    drive_outcomes = rz_drives.groupby(['game_id', 'drive', 'posteam', 'defteam']).agg(
-        td=('touchdown', 'max'),
-        int=('interception', 'max'),
-        fum=('fumble_lost', 'max')
-    ).reset_index()
-    
-    drive_outcomes['stalled'] = ~((drive_outcomes['td'] == 1) | (drive_outcomes['int'] == 1) | (drive_outcomes['fum'] == 1))
-    
-    off = drive_outcomes.groupby('posteam')['stalled'].mean().reset_index().rename(columns={'stalled': 'off_stall_rate'})
-    defs = drive_outcomes.groupby('defteam')['stalled'].mean().reset_index().rename(columns={'stalled': 'def_stall_rate'})
-    
-    off['off_stall_rate'] = (off['off_stall_rate'] * 100).round(1)
-    defs['def_stall_rate'] = (defs['def_stall_rate'] * 100).round(1)
-    
-    return off, defs
+def round1(values):
+    """
+    Vectorized round(x, 1). np.round disagrees with Python's round() on values that sit
+    on a .x5 boundary in binary, so those few are resolved with round() to keep outputs stable.
+    """
+    values = np.asarray(values, dtype='float64')
+    out = np.round(values, 1)
+    scaled = values * 10
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        out[ties] = [round(float(v), 1) for v in values[ties]]
+    return out
 
-def analyze_past_3_weeks_strict(target_week, pbp, schedule, current_stats):
-    print(f"🔙 Analyzing Last 3 Weeks...")
-    weeks_to_analyze = [w for w in [target_week-1, target_week-2, target_week-3] if w >= 1]
-    
-    def calc_simple_pts(row):
-        if row['play_type'] == 'field_goal':
-            if row['field_goal_result'] == 'made': return 5 if row['kick_distance'] >= 50 else 4 if row['kick_distance'] >= 40 else 3
-            return -1
-        if row['play_type'] == 'extra_point': return 1 if row['extra_point_result'] == 'good' else -1
-        return 0
-    
-    relevant_pbp = pbp[pbp['week'].isin(weeks_to_analyze)].copy()
-    relevant_pbp['pts'] = relevant_pbp.apply(calc_simple_pts, axis=1)
-    actuals_map = relevant_pbp.groupby(['week', 'kicker_player_id'])['pts'].sum().to_dict()
+def build_game_index(schedule, weeks):
+    """
+    One row per (team, week) with opponent, home flag and Vegas lines, from both sides of each game.
+    """
+    games = schedule[schedule['week'].isin(weeks)]
+    total = games['total_line'].fillna(44.0)
+    spread = games['spread_line'].fillna(0.0)
+    home = pd.DataFrame({'team': games['home_team'], 'week': games['week'], 'opp': games['away_team'],
+                         'is_home': True, 'vegas_implied': (total + spread) / 2})
+    away = pd.DataFrame({'team': games['away_team'], 'week': games['week'], 'opp': games['home_team'],
+                         'is_home': False, 'vegas_implied': (total - spread) / 2})
+    return pd.concat([home, away]).drop_duplicates(subset=['team', 'week'], keep='first')
+
+def score_simple_pts(plays):
+    """Vectorized backtest scoring: FG 3/4/5 by distance, XP 1, any miss -1."""
+    is_fg = (plays['play_type'] == 'field_goal').to_numpy(dtype=bool)
+    is_xp = (plays['play_type'] == 'extra_point').to_numpy(dtype=bool)
+    fg_made = (plays['field_goal_result'] == 'made').to_numpy(dtype=bool)
+    xp_good = (plays['extra_point_result'] == 'good').to_numpy(dtype=bool)
+    dist = plays['kick_distance'].to_numpy(dtype='float64', na_value=np.nan)
+    made_pts = np.where(dist >= 50, 5, np.where(dist >= 40, 4, 3))
+    return np.select([is_fg & fg_made, is_fg, is_xp & xp_good, is_xp], [made_pts, -1, 1, -1], default=0)
+
+def analyze_past_3_weeks_strict(target_week, pbp, schedule, current_stats, window=3, projections=None):
+    """
+    Backtest over the last `window` weeks, built from joins:
+    kickers x weeks -> (team, week) game index -> (week, kicker) participation and actuals.
+    `projections` (week, kicker_player_id, proj), e.g. replayed engine projections, is used where
+    available; otherwise the projection is the simple Vegas multiplier on season avg_pts.
+    """
+    print(f"🔙 Analyzing Last {window} Weeks...")
+    weeks_to_analyze = [w for w in range(target_week - 1, target_week - window - 1, -1) if w >= 1]
+    if not weeks_to_analyze or current_stats.empty:
+        return {}
+
+    relevant_pbp = pbp[pbp['week'].isin(weeks_to_analyze)]
+    played = relevant_pbp[['week', 'kicker_player_id']].dropna().drop_duplicates()
+    played['played'] = True
+    actuals = (relevant_pbp[['week', 'kicker_player_id']]
+               .assign(act=score_simple_pts(relevant_pbp))
+               .groupby(['week', 'kicker_player_id'])['act'].sum().reset_index())
+
+    # Last row per kicker wins, first-seen order is kept (same as filling a dict)
+    kickers = current_stats[['kicker_player_id', 'team', 'avg_pts']].copy()
+    first_seen = kickers.drop_duplicates('kicker_player_id', keep='first')['kicker_player_id']
+    kickers = kickers.drop_duplicates('kicker_player_id', keep='last').set_index('kicker_player_id').loc[first_seen].reset_index()
+
+    grid = kickers.merge(pd.DataFrame({'week': weeks_to_analyze}), how='cross')
+    grid = grid.merge(build_game_index(schedule, weeks_to_analyze), on=['team', 'week'], how='left')
+    grid = grid.merge(played, on=['week', 'kicker_player_id'], how='left')
+    grid = grid.merge(actuals, on=['week', 'kicker_player_id'], how='left')
+    if projections is not None and not projections.empty:
+        replayed = projections[['week', 'kicker_player_id', 'proj']].rename(columns={'proj': 'replay_proj'})
+        grid = grid.merge(replayed, on=['week', 'kicker_player_id'], how='left')
+    else:
+        grid['replay_proj'] = np.nan
+
+    has_game = grid['opp'].notna().to_numpy()
+    active = has_game & grid['played'].fillna(False).astype(bool).to_numpy()
+    vegas = grid['vegas_implied'].to_numpy(dtype='float64', na_value=np.nan)
+    mult = np.where(vegas > 24, 1.15, np.where(vegas < 18, 0.85, 1.0))
+    simple = round1(grid['avg_pts'].to_numpy(dtype='float64') * mult)
+    replay = grid['replay_proj'].to_numpy(dtype='float64', na_value=np.nan)
+    proj = np.where(active, np.where(np.isnan(replay), simple, replay), 0.0)
+    act = np.where(active, grid['act'].fillna(0).to_numpy(), 0).astype(int)
+
+    grid['status'] = np.select([active, has_game], ['ACTIVE', 'DNS'], default='BYE')
+    grid['opp'] = grid['opp'].fillna('BYE')
+    grid['proj'] = proj
+    grid['act'] = act
+    grid['diff'] = round1(act - proj)
 
     history_data = {}
-    for _, kicker in current_stats.iterrows():
-        pid = kicker['kicker_player_id']
-        team = kicker['team']
-        team_schedule = schedule[(schedule['week'].isin(weeks_to_analyze)) & 
-                                 ((schedule['home_team'] == team) | (schedule['away_team'] == team))].copy()
-        games_list = []
-        total_act = 0
-        total_proj = 0
-        
-        for wk in weeks_to_analyze:
-            game = team_schedule[team_schedule['week'] == wk]
-            if game.empty:
-                games_list.append({'week': int(wk), 'status': 'BYE', 'proj': 0, 'act': 0, 'diff': 0, 'opp': 'BYE'})
-                continue
-            game = game.iloc[0]
-            is_home = (game['home_team'] == team)
-            opp = game['away_team'] if is_home else game['home_team']
-            
-            player_played = not relevant_pbp[(relevant_pbp['week'] == wk) & (relevant_pbp['kicker_player_id'] == pid)].empty
-            if not player_played:
-                games_list.append({'week': int(wk), 'status': 'DNS', 'proj': 0, 'act': 0, 'diff': 0, 'opp': opp})
-                continue
-            
-            total_line = game['total_line'] if pd.notna(game['total_line']) else 44.0
-            spread_line = game['spread_line'] if pd.notna(game['spread_line']) else 0.0
-            
-            if is_home: vegas_implied = (total_line + spread_line) / 2
-            else: vegas_implied = (total_line - spread_line) / 2
-                
-            base = kicker['avg_pts']
-            mult = 1.15 if vegas_implied > 24 else (0.85 if vegas_implied < 18 else 1.0)
-            proj = round(base * mult, 1)
-            act = int(actuals_map.get((wk, pid), 0))
-            total_act += act
-            total_proj += proj
-            
-            games_list.append({'week': int(wk), 'status': 'ACTIVE', 'proj': proj, 'act': act, 'diff': round(act - proj, 1), 'opp': opp})
-            
-        history_data[pid] = {'l3_actual': int(total_act), 'l3_proj': round(float(total_proj), 1), 'l3_games': games_list}
-    return history_data
\ No newline at end of file
+    for pid, games in grid.groupby('kicker_player_id', sort=False):
+        games_list = [
+            {'week': int(wk), 'status': st, 'proj': float(p), 'act': int(a), 'diff': float(d), 'opp': opp}
+            if st == 'ACTIVE' else
+            {'week': int(wk), 'status': st, 'proj': 0, 'act': 0, 'diff': 0, 'opp': opp}
+            for wk, st, p, a, d, opp in zip(games['week'], games['status'], games['proj'], games['act'], games['diff'], games['opp'])
+        ]
+        history_data[pid] = {'l3_actual': int(games['act'].sum()), 'l3_proj': round(float(games['proj'].sum()), 1), 'l3_games': games_list}
+    return history_data
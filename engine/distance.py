@@ -0,0 +1,69 @@
+import pandas as pd
+import numpy as np
+from engine.data import KICK_CODES, FG_MADE_CODES, FG_MISS_CODES
+
+# Longest kick tracked per yard; anything longer lands in the last bin
+MAX_YARDS = 70
+
+def build_distance_histograms(kicks):
+    """
+    1-yard distance histograms per (kicker, week) from the kick feature table, as dense arrays:
+    fg_made / fg_miss are [kicker, week, yard] counts (yard 0..MAX_YARDS); FGs without a distance
+    and XPs are [kicker, week] counts. Built with one bincount per array, no per-kicker loops.
+    """
+    # Kicks can carry a name without an id; they can't be attributed to a kicker row
+    kicks = kicks[kicks['kicker_player_id'].notna()]
+    ids = kicks['kicker_player_id'].astype(str).to_numpy()
+    kicker_ids = np.unique(ids)
+    weeks = np.arange(1, int(kicks['week'].max()) + 1 if not kicks.empty else 1, dtype='int16')
+    n_k, n_w, n_y = len(kicker_ids), len(weeks), MAX_YARDS + 1
+
+    k = np.searchsorted(kicker_ids, ids)
+    w = kicks['week'].to_numpy(dtype='int64') - 1
+    code = kicks['code'].to_numpy()
+    dist = kicks['kick_distance'].to_numpy(dtype='float64', na_value=np.nan)
+    has_dist = ~np.isnan(dist)
+    yard = np.clip(np.where(has_dist, dist, 0), 0, MAX_YARDS).astype('int64')
+
+    def yard_hist(mask):
+        flat = np.bincount(((k * n_w + w) * n_y + yard)[mask], minlength=n_k * n_w * n_y)
+        return flat.reshape(n_k, n_w, n_y).astype('uint16')
+
+    def week_counts(mask):
+        return np.bincount((k * n_w + w)[mask], minlength=n_k * n_w).reshape(n_k, n_w).astype('uint16')
+
+    fg_made = np.isin(code, FG_MADE_CODES)
+    fg_miss = np.isin(code, FG_MISS_CODES)
+    return {
+        'kicker_ids': kicker_ids,
+        'weeks': weeks,
+        'fg_made': yard_hist(fg_made & has_dist),
+        'fg_miss': yard_hist(fg_miss & has_dist),
+        'fg_made_nodist': week_counts(fg_made & ~has_dist),
+        'fg_miss_nodist': week_counts(fg_miss & ~has_dist),
+        'xp_made': week_counts(code == KICK_CODES.index('xp_made')),
+        'xp_miss': week_counts(code == KICK_CODES.index('xp_miss')),
+    }
+
+def score_distance(store, made, miss=-1, xp_made=1, xp_miss=-1, made_nodist=0):
+    """
+    Fantasy points per [kicker, week] for any distance scoring. `made` / `miss` are either a number
+    or a function of yards (a NumPy array 0..MAX_YARDS), e.g. made=lambda y: 0.1 * y.
+    Each function is evaluated once over the yard axis and applied as a dot product.
+    Misses without a recorded distance get miss(0) when `miss` is a function.
+    """
+    yards = np.arange(MAX_YARDS + 1, dtype='float64')
+    curve = lambda f: np.broadcast_to(np.asarray(f(yards) if callable(f) else f, dtype='float64'), yards.shape)
+    miss_curve = curve(miss)
+    counts = lambda name: store[name].astype('float64')
+    return (
+        counts('fg_made') @ curve(made) + counts('fg_miss') @ miss_curve
+        + counts('fg_made_nodist') * made_nodist + counts('fg_miss_nodist') * miss_curve[0]
+        + counts('xp_made') * xp_made + counts('xp_miss') * xp_miss
+    )
+
+def points_by_kicker(store, points, ids, weeks=None):
+    """Sums [kicker, week] points over `weeks` (default: all) and aligns them to `ids` (0 if unseen)."""
+    cols = np.isin(store['weeks'], list(weeks)) if weeks is not None else slice(None)
+    totals = pd.Series(points[:, cols].sum(axis=1), index=store['kicker_ids'])
+    return pd.Series(ids, dtype=object).map(totals).fillna(0.0).to_numpy()
@@ -0,0 +1,106 @@
+import pandas as pd
+import numpy as np
+import os
+from engine.config import CACHE_DIR
+from engine.columns import declare_pbp_columns
+from engine.data import FG_MADE_CODES
+
+declare_pbp_columns('drives', [
+    'week', 'game_id', 'play_id', 'drive', 'posteam', 'defteam', 'down', 'yardline_100',
+    'play_type', 'touchdown', 'interception', 'fumble_lost'
+])
+
+DRIVE_KEYS = ['game_id', 'drive', 'posteam', 'defteam']
+DRIVE_COLUMNS = DRIVE_KEYS + [
+    'week', 'reached_rz', 'rz_td', 'rz_int', 'rz_fum', 'stalled',
+    'fourth_opps', 'fourth_goes', 'kicker_pts', 'outcome', 'game_plays'
+]
+
+def build_drive_summary(pbp, kicks):
+    """
+    One row per drive with everything the team metrics need:
+    red-zone reached (inside the 25) and how it ended there, drive outcome (TD/FG/TURNOVER/DOWNS/OTHER),
+    4th-down decisions inside the 30 and kicker points.
+    """
+    if pbp.empty:
+        return pd.DataFrame(columns=DRIVE_COLUMNS)
+
+    yardline = pbp['yardline_100']
+    in_rz = (yardline <= 25) & yardline.notnull()
+    fourth = (pbp['down'] == 4) & (yardline <= 30)
+    plays = pd.DataFrame({
+        **{k: pbp[k] for k in DRIVE_KEYS},
+        'week': pbp['week'],
+        'in_rz': in_rz,
+        'rz_td': pbp['touchdown'].where(in_rz),
+        'rz_int': pbp['interception'].where(in_rz),
+        'rz_fum': pbp['fumble_lost'].where(in_rz),
+        'td': pbp['touchdown'] == 1,
+        'turnover': (pbp['interception'] == 1) | (pbp['fumble_lost'] == 1),
+        'fourth_opp': fourth,
+        'fourth_go': fourth & pbp['play_type'].isin(['pass', 'run']),
+        'last_go': (pbp['down'] == 4) & pbp['play_type'].isin(['pass', 'run']),
+    })
+
+    drives = plays.groupby(DRIVE_KEYS, dropna=False, sort=False).agg(
+        week=('week', 'first'),
+        reached_rz=('in_rz', 'any'),
+        rz_td=('rz_td', 'max'), rz_int=('rz_int', 'max'), rz_fum=('rz_fum', 'max'),
+        td=('td', 'any'), turnover=('turnover', 'any'),
+        fourth_opps=('fourth_opp', 'sum'), fourth_goes=('fourth_go', 'sum'),
+        last_go=('last_go', 'last'),
+    ).reset_index()
+
+    # A red-zone trip that didn't end in a TD or a giveaway stalled
+    drives['stalled'] = drives['reached_rz'] & ~((drives['rz_td'] == 1) | (drives['rz_int'] == 1) | (drives['rz_fum'] == 1))
+
+    kick_drives = kicks.assign(fg_made=kicks['code'].isin(FG_MADE_CODES)).groupby(
+        ['game_id', 'drive', 'posteam'], dropna=False).agg(kicker_pts=('real_pts', 'sum'), fg_made=('fg_made', 'any')).reset_index()
+    drives = drives.merge(kick_drives, on=['game_id', 'drive', 'posteam'], how='left')
+    drives['kicker_pts'] = drives['kicker_pts'].fillna(0).astype('int64')
+    fg_made = drives['fg_made'].fillna(False).astype(bool)
+
+    drives['outcome'] = np.select(
+        [drives['td'], fg_made, drives['turnover'], drives['last_go']],
+        ['TD', 'FG', 'TURNOVER', 'DOWNS'], default='OTHER'
+    )
+    drives['game_plays'] = drives['game_id'].map(pbp.groupby('game_id').size())
+    return drives[DRIVE_COLUMNS]
+
+def load_drive_summary(season, pbp, kicks, cache_dir=CACHE_DIR):
+    """
+    Drive summary with a per-season Parquet cache. A game's drives are reused while its play
+    count is unchanged, so only new or still-updating games are summarized each run.
+    """
+    path = os.path.join(cache_dir, "drives", f"{season}.parquet")
+    cached = pd.DataFrame(columns=DRIVE_COLUMNS)
+    try:
+        if os.path.exists(path):
+            cached = pd.read_parquet(path)
+            if list(cached.columns) != DRIVE_COLUMNS:
+                cached = pd.DataFrame(columns=DRIVE_COLUMNS)
+    except Exception as e:
+        print(f"   ⚠️ Drive cache unreadable, rebuilding: {e}")
+
+    game_plays = pbp.groupby('game_id').size()
+    cached_plays = cached.groupby('game_id')['game_plays'].first() if not cached.empty else pd.Series(dtype='int64')
+    common = cached_plays.index.intersection(game_plays.index)
+    reuse = common[cached_plays[common].to_numpy() == game_plays[common].to_numpy()]
+    rebuild = game_plays.index.difference(reuse)
+
+    if rebuild.empty:
+        print(f"   ✅ Drive summary cache hit ({len(reuse)} games).")
+        return cached[cached['game_id'].isin(game_plays.index)].reset_index(drop=True)
+
+    fresh = build_drive_summary(pbp[pbp['game_id'].isin(rebuild)], kicks[kicks['game_id'].isin(rebuild)])
+    kept = cached[cached['game_id'].isin(reuse)]
+    summary = pd.concat([kept, fresh], ignore_index=True) if not kept.empty else fresh.reset_index(drop=True)
+    print(f"   💾 Drive summary: rebuilt {len(rebuild)} games, reused {len(reuse)}.")
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        summary.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print(f"   ⚠️ Could not write drive cache: {e}")
+    return summary
@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+import os
+from engine.config import CACHE_DIR
+
+# Rolling window (weeks) for the team features the model reads
+FEATURE_WINDOW = 4
+# Extra windows (in weeks) for the kicker share-of-points features. None = season to date.
+SHARE_WINDOWS = {'l2': 2, 'l4': 4, 'l8': 8, 'season': None}
+SHARE_WINDOW_COLUMNS = [f'{side}_share_{name}' for side in ('off', 'def') for name in SHARE_WINDOWS]
+FEATURE_COLUMNS = [
+    'off_ppg', 'def_pa', 'off_stall_rate', 'def_stall_rate',
+    'off_share', 'def_share', 'aggression_pct', 'rz_trips'
+] + SHARE_WINDOW_COLUMNS
+
+def _dense(teams, n_weeks, keys, weeks, values):
+    """Scatters (team, week) values into a teams x weeks array (summing duplicates)."""
+    grid = np.zeros((len(teams), n_weeks), dtype='float64')
+    t = teams.get_indexer(keys)
+    w = np.asarray(weeks, dtype='int64') - 1
+    ok = (t >= 0) & (w >= 0) & (w < n_weeks)
+    np.add.at(grid, (t[ok], w[ok]), np.asarray(values, dtype='float64')[ok])
+    return grid
+
+def _window_sum(grid, window):
+    """Trailing `window`-week sum for every week (None = season to date)."""
+    if window is None:
+        return np.cumsum(grid, axis=1)
+    padded = np.pad(grid, ((0, 0), (window - 1, 0)))
+    return np.lib.stride_tricks.sliding_window_view(padded, window, axis=1).sum(axis=-1)
+
+def _rate(num, den, scale=1.0, digits=None):
+    out = np.divide(num, den, out=np.full(num.shape, np.nan), where=den > 0) * scale
+    return np.round(out, digits) if digits is not None else out
+
+def build_team_week_features(team_games, drives, share_table, window=FEATURE_WINDOW):
+    """
+    Team feature store: one row per (team, week) holding the trailing `window` weeks *through* that
+    week (off/def PPG, red-zone stall rates, kicker shares, 4th-down aggression) plus season-to-date
+    red-zone trips and the kicker shares over every SHARE_WINDOWS length. Every team/week is computed at once from dense team x week arrays.
+    Inputs come from build_team_game_table, the drive summary and build_team_share_table.
+    A team with no games/drives in a window gets NaN for that feature.
+    """
+    played = team_games[team_games['pts'].notna()]
+    teams = pd.Index(sorted(set(team_games['team'].dropna()) |
+                            set(drives['posteam'].dropna()) | set(drives['defteam'].dropna())))
+    n_weeks = int(max(team_games['week'].max() if not team_games.empty else 0,
+                      drives['week'].max() if not drives.empty else 0, 0))
+    if teams.empty or n_weeks == 0:
+        return pd.DataFrame(columns=['team', 'week'] + FEATURE_COLUMNS)
+
+    def roll(keys, weeks, values):
+        return _window_sum(_dense(teams, n_weeks, keys, weeks, values), window)
+
+    # Points scored / allowed
+    games = roll(played['team'], played['week'], np.ones(len(played)))
+    off_ppg = _rate(roll(played['team'], played['week'], played['pts']), games, digits=1)
+    def_pa = _rate(roll(played['team'], played['week'], played['pa']), games, digits=1)
+
+    # Red-zone stall rates: share of red-zone trips that stalled (see engine/drives.py)
+    rz = drives[drives['reached_rz']].dropna(subset=['game_id', 'drive', 'posteam', 'defteam'])
+    stalled = rz['stalled'].astype('float64')
+    off_stall = _rate(roll(rz['posteam'], rz['week'], stalled), roll(rz['posteam'], rz['week'], np.ones(len(rz))), 100, 1)
+    def_stall = _rate(roll(rz['defteam'], rz['week'], stalled), roll(rz['defteam'], rz['week'], np.ones(len(rz))), 100, 1)
+
+    # Kicker share of points scored (offense) and allowed (defense): the model window plus every
+    # SHARE_WINDOWS length, all from the same two dense grids per side
+    shares = {}
+    for side, key in [('off', 'team'), ('def', 'opponent')]:
+        total = _dense(teams, n_weeks, share_table[key], share_table['week'], share_table['share'])
+        count = _dense(teams, n_weeks, share_table[key], share_table['week'], np.ones(len(share_table)))
+        shares[f'{side}_share'] = _rate(_window_sum(total, window), _window_sum(count, window))
+        for name, length in SHARE_WINDOWS.items():
+            shares[f'{side}_share_{name}'] = _rate(_window_sum(total, length), _window_sum(count, length))
+
+    # 4th-down aggression and season-to-date red-zone trips
+    off_drives = drives[drives['posteam'].notna()]
+    aggression = _rate(roll(off_drives['posteam'], off_drives['week'], off_drives['fourth_goes']),
+                       roll(off_drives['posteam'], off_drives['week'], off_drives['fourth_opps']), 100, 1)
+    rz_off = drives[drives['reached_rz'] & drives['posteam'].notna()]
+    rz_trips = np.cumsum(_dense(teams, n_weeks, rz_off['posteam'], rz_off['week'], np.ones(len(rz_off))), axis=1)
+
+    store = pd.DataFrame({
+        'team': np.repeat(teams.to_numpy(), n_weeks),
+        'week': np.tile(np.arange(1, n_weeks + 1), len(teams)).astype('int16'),
+        'off_ppg': off_ppg.ravel(), 'def_pa': def_pa.ravel(),
+        'off_stall_rate': off_stall.ravel(), 'def_stall_rate': def_stall.ravel(),
+        'off_share': shares['off_share'].ravel(), 'def_share': shares['def_share'].ravel(),
+        'aggression_pct': aggression.ravel(), 'rz_trips': rz_trips.ravel().astype('int64'),
+        **{name: shares[name].ravel() for name in SHARE_WINDOW_COLUMNS},
+    })
+    store['team'] = store['team'].astype('category')
+    return store
+
+def team_features_at(store, week, column, key='team'):
+    """(team, value) rows for one feature as of `week`, dropping teams without data."""
+    rows = store[store['week'] == week]
+    out = pd.DataFrame({key: rows['team'].astype(object).to_numpy(), column: rows[column].to_numpy()})
+    return out.dropna().reset_index(drop=True)
+
+def save_feature_store(store, season, cache_dir=CACHE_DIR):
+    """Persists the store as Parquet so replays/backfills can look features up without rebuilding."""
+    path = os.path.join(cache_dir, "features", f"team_week_{season}.parquet")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        store.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print(f"   ⚠️ Could not write feature store: {e}")
+    return path
+
+def load_feature_store(season, cache_dir=CACHE_DIR):
+    """Reads a persisted store, or None when it isn't there or predates the current FEATURE_COLUMNS."""
+    path = os.path.join(cache_dir, "features", f"team_week_{season}.parquet")
+    try:
+        store = pd.read_parquet(path) if os.path.exists(path) else None
+    except Exception as e:
+        print(f"   ⚠️ Feature store unreadable: {e}")
+        return None
+    if store is not None and not set(FEATURE_COLUMNS) <= set(store.columns):
+        print(f"   ⚠️ Feature store for {season} is missing columns, rebuilding.")
+        return None
+    return store
@@ -1,18 +1,113 @@
 import pandas as pd
 import json
 import os
-from engine.data import get_kicker_scores_for_week
+from engine.data import get_kicker_scores_for_week, get_kicker_scores_by_week, KICK_COUNT_COLS
+from engine.columns import declare_pbp_columns
+from engine.output import write_json_if_changed
 
-def load_history(file_path="public/kicker_data.json"):
-    """Loads existing history from the JSON file if it exists."""
+declare_pbp_columns('history', [
+    'week', 'play_type', 'kick_distance', 'field_goal_result', 'extra_point_result',
+    'kicker_player_id', 'kicker_player_name'
+])
+
+HISTORY_FORMAT = "columnar-v1"
+
+def encode_history(history):
+    """
+    Columnar history: one player dictionary, the count column header, and per week the player
+    indexes, a flat row-major count array (len(columns) ints per player) and the projections.
+    """
+    weeks = sorted(history, key=int)
+    ids, names, index = [], [], {}
+    for wk in weeks:
+        for r in history[wk]:
+            if r['id'] not in index:
+                index[r['id']] = len(ids)
+                ids.append(r['id'])
+                names.append(r.get('name'))
+            else:
+                names[index[r['id']]] = r.get('name')
+
+    encoded = {}
+    for wk in weeks:
+        records = history[wk]
+        week = {
+            'players': [index[r['id']] for r in records],
+            'counts': [int(r.get(c) or 0) for r in records for c in KICK_COUNT_COLS],
+        }
+        if any('proj' in r for r in records):
+            week['proj'] = [r.get('proj') for r in records]
+        encoded[wk] = week
+
+    return {'format': HISTORY_FORMAT, 'players': {'ids': ids, 'names': names}, 'columns': KICK_COUNT_COLS, 'weeks': encoded}
+
+def decode_history(data):
+    """Inverse of encode_history."""
+    if 'weeks' not in data:
+        return {}
+
+    ids, names = data['players']['ids'], data['players']['names']
+    columns = data['columns']
+    width = len(columns)
+    history = {}
+    for wk, week in data['weeks'].items():
+        counts = week['counts']
+        proj = week.get('proj')
+        records = []
+        for i, p in enumerate(week['players']):
+            record = {'id': ids[p], 'name': names[p]}
+            record.update(zip(columns, counts[i * width:(i + 1) * width]))
+            if proj is not None and proj[i] is not None:
+                record['proj'] = proj[i]
+            records.append(record)
+        history[wk] = records
+    return history
+
+HISTORY_SHARD_DIR = "public/history"
+
+def write_history_shards(history, shard_dir=HISTORY_SHARD_DIR):
+    """
+    Writes one shard per week (<week>.json) and per kicker (kicker/<id>.json), each a columnar
+    document readable by decode_history, plus manifest.json with every shard's content hash.
+    Shards whose bytes are unchanged are left untouched.
+    """
+    manifest = {'format': 'sharded-' + HISTORY_FORMAT, 'columns': KICK_COUNT_COLS, 'weeks': {}, 'kickers': {}}
+    written = 0
+
+    for wk in sorted(history, key=int):
+        digest, changed = write_json_if_changed(os.path.join(shard_dir, f"{wk}.json"), encode_history({wk: history[wk]}))
+        manifest['weeks'][wk] = {'hash': digest, 'players': len(history[wk])}
+        written += changed
+
+    by_kicker = {}
+    for wk in sorted(history, key=int):
+        for record in history[wk]:
+            by_kicker.setdefault(record['id'], {})[wk] = [record]
+    for pid in sorted(by_kicker):
+        weeks = by_kicker[pid]
+        digest, changed = write_json_if_changed(os.path.join(shard_dir, "kicker", f"{pid}.json"), encode_history(weeks))
+        manifest['kickers'][pid] = {'hash': digest, 'name': weeks[max(weeks, key=int)][0].get('name')}
+        written += changed
+
+    write_json_if_changed(os.path.join(shard_dir, "manifest.json"), manifest)
+    total = len(manifest['weeks']) + len(manifest['kickers'])
+    print(f"   💾 History shards: {written} of {total} rewritten.")
+    return manifest
+
+def load_history_shards(shard_dir=HISTORY_SHARD_DIR):
+    """Reassembles {week: records} from the week shards listed in the manifest ({} if there is none)."""
+    history = {}
     try:
-        if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                data = json.load(f)
-                return data.get("history", {})
+        with open(os.path.join(shard_dir, "manifest.json"), "r") as f:
+            manifest = json.load(f)
+        for wk in manifest.get('weeks', {}):
+            with open(os.path.join(shard_dir, f"{wk}.json"), "r") as f:
+                history.update(decode_history(json.load(f)))
+    except FileNotFoundError:
+        return {}
     except Exception as e:
-        print(f"⚠️ Could not load existing history: {e}")
-    return {}
+        print(f"⚠️ Could not load history shards: {e}")
+    return history
 
 def update_history(history, pbp_data, current_week):
     """
@@ -46,4 +141,46 @@ def update_history(history, pbp_data, current_week):
     else:
         print(f"   ⚠️ No data found for Week {last_week}. Game processing might be incomplete.")
 
-    return history
\ No newline at end of file
+    return history
+
+def saved_projections(history):
+    """Flattens the projections already stored in history into a (week, id) -> proj frame."""
+    rows = [(int(wk), r['id'], r.get('proj', 0)) for wk, records in history.items() for r in records]
+    saved = pd.DataFrame(rows, columns=['week', 'id', 'proj'])
+    return saved.drop_duplicates(subset=['week', 'id'], keep='last')
+
+def rebuild_history(history, kicks, target_week):
+    """
+    Recomputes actuals for weeks 1..target_week in one grouped pass and keeps saved projections
+    via a keyed (week, id) join. Weeks with no kicks keep whatever was saved.
+    """
+    weekly = get_kicker_scores_by_week(kicks, target_week)
+    if weekly.empty:
+        return history
+
+    weekly = pd.merge(weekly, saved_projections(history), on=['week', 'id'], how='left')
+    rebuilt = dict(history)
+    for wk, records in weekly.groupby('week', sort=True):
+        week_str = str(int(wk))
+        records = records.drop(columns=['week'])
+        # Unsaved weeks get proj=0 too (replayed projections land later), so the first build and
+        # a rerun on the same data produce identical records
+        records['proj'] = records['proj'].astype('float64').fillna(0.0)
+        rebuilt[week_str] = records.to_dict(orient='records')
+    return rebuilt
+
+def apply_projections(history, projections):
+    """
+    Writes (week, kicker_player_id, proj) rows, e.g. from engine/replay.py, onto the stored weekly
+    records. Records without a matching row keep what they had.
+    """
+    if projections.empty:
+        return history
+    lookup = {(int(w), pid): float(p) for w, pid, p in
+              zip(projections['week'], projections['kicker_player_id'], projections['proj'])}
+    for week_str, records in history.items():
+        for record in records:
+            proj = lookup.get((int(week_str), record['id']))
+            if proj is not None:
+                record['proj'] = proj
+    return history
@@ -0,0 +1,41 @@
+import pandas as pd
+import numpy as np
+
+# Roster status codes (nflverse rosters)
+ROSTER_IR_CODES = ['RES', 'NON', 'SUS', 'PUP']
+ROSTER_CUT_CODES = ['WAIVED', 'REL', 'CUT', 'RET']
+ROSTER_PS_CODE = 'DEV'
+INACTIVE_ROSTER_CODES = ROSTER_IR_CODES + ROSTER_CUT_CODES + [ROSTER_PS_CODE]
+
+def classify_injuries(df, roster_col='roster_status', cbs_status_col='cbs_status', cbs_injury_col='cbs_injury'):
+    """
+    Vectorized injury status for any player table (one week or many seasons).
+    Roster codes win over the CBS report. String work runs on categoricals, so it is done once
+    per distinct status rather than once per row.
+    Returns injury_status, injury_color and injury_details aligned to df.index.
+    """
+    def column(name):
+        return df[name] if name in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+
+    roster = column(roster_col).astype(object).fillna('').astype(str).astype('category')
+    cbs_st = column(cbs_status_col).astype(object).fillna('').astype(str).astype('category').str.title()
+    cbs_det = column(cbs_injury_col).astype(object).fillna('nan').astype(str)
+    cbs_label = (cbs_st + ' (' + cbs_det + ')').to_numpy(dtype=object)
+
+    conditions = [
+        roster.isin(ROSTER_IR_CODES).to_numpy(),
+        roster.isin(ROSTER_CUT_CODES).to_numpy(),
+        (roster == ROSTER_PS_CODE).to_numpy(),
+        cbs_st.str.contains('Out|Ir|Inactive', regex=True).to_numpy(dtype=bool),
+        cbs_st.str.contains('Doubtful', regex=False).to_numpy(dtype=bool),
+        cbs_st.str.contains('Questionable', regex=False).to_numpy(dtype=bool),
+    ]
+    status = np.select(conditions, ['IR', 'CUT', 'Practice Squad', 'OUT', 'Doubtful', 'Questionable'], default='Healthy')
+    color = np.select(conditions, ['red-700', 'red-700', 'yellow-500', 'red-700', 'red-400', 'yellow-500'], default='green')
+    details = np.select(
+        conditions,
+        [('Roster: ' + roster.astype(str)).to_numpy(dtype=object), 'Released', 'Roster: Practice Squad', cbs_label, cbs_label, cbs_label],
+        default='Active'
+    )
+
+    return pd.DataFrame({'injury_status': status, 'injury_color': color, 'injury_details': details}, index=df.index)
@@ -0,0 +1,65 @@
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # optional: without it only the .gz sibling is written
+    brotli = None
+
+def _write_bytes(path, data):
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+
+def _unchanged(path, body):
+    try:
+        with open(path, "rb") as f:
+            return f.read() == body
+    except FileNotFoundError:
+        return False
+
+def write_json_artifact(path, payload):
+    """
+    Writes minified JSON plus precompressed .gz (and .br when brotli is installed) siblings.
+    Returns the byte sizes, including what the old indent=2 output would have been.
+    When the JSON is byte-identical to what is on disk nothing is rewritten.
+    """
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    sizes = {'pretty': len(json.dumps(payload, indent=2).encode('utf-8')), 'min': len(body)}
+
+    siblings = [path + ".gz"] + ([path + ".br"] if brotli is not None else [])
+    if _unchanged(path, body) and all(os.path.exists(p) for p in siblings):
+        sizes['gz'] = os.path.getsize(path + ".gz")
+        if brotli is not None:
+            sizes['br'] = os.path.getsize(path + ".br")
+        print(f"   ✅ {os.path.basename(path)} unchanged ({sizes['min'] / 1024:.1f}KB), not rewritten.")
+        return sizes
+    _write_bytes(path, body)
+
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    _write_bytes(path + ".gz", gz)
+    sizes['gz'] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(body, quality=11)
+        _write_bytes(path + ".br", br)
+        sizes['br'] = len(br)
+
+    steps = " → ".join(f"{sizes[k] / 1024:.1f}KB {k}" for k in ['pretty', 'min', 'gz', 'br'] if k in sizes)
+    print(f"   💾 {os.path.basename(path)}: {steps}")
+    return sizes
+
+def write_json_if_changed(path, payload):
+    """
+    Writes minified JSON only when the bytes differ from what is on disk.
+    Returns (content hash, whether the file was written).
+    """
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha1(body).hexdigest()[:12]
+    if _unchanged(path, body):
+        return digest, False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _write_bytes(path, body)
+    return digest, True
@@ -0,0 +1,156 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import requests
+import io
+import time
+import json
+import os
+from email.utils import parsedate_to_datetime
+from engine.config import CACHE_DIR, GAME_TZ, PBP_SETTLE_HOURS
+from engine.data import load_data_with_retry
+from engine.columns import declare_pbp_columns, required_pbp_columns, project_pbp
+
+PBP_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_{season}.parquet"
+
+declare_pbp_columns('pbp_cache', ['game_id', 'week'])
+
+def _season_dir(season, cache_dir):
+    return os.path.join(cache_dir, "pbp", str(season))
+
+def _partition_path(season_dir, week):
+    return os.path.join(season_dir, f"week_{int(week):02d}.parquet")
+
+def _load_manifest(season_dir):
+    """Manifest tracks which games are final (never refetched) and the release version we last saw."""
+    path = os.path.join(season_dir, "manifest.json")
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"   ⚠️ PBP cache manifest unreadable, rebuilding: {e}")
+    return {"version": None, "final_games": [], "columns": []}
+
+def _save_manifest(season_dir, manifest):
+    path = os.path.join(season_dir, "manifest.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+def _read_partitions(season_dir):
+    if not os.path.isdir(season_dir):
+        return pd.DataFrame()
+    files = sorted(f for f in os.listdir(season_dir) if f.startswith("week_") and f.endswith(".parquet"))
+    if not files:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(os.path.join(season_dir, f)) for f in files], ignore_index=True)
+
+def _write_partition(season_dir, week, df):
+    path = _partition_path(season_dir, week)
+    df.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+def _kickoffs(schedule):
+    """Tz-aware kickoff per schedule row (gameday/gametime are Eastern)."""
+    kickoff = pd.to_datetime(schedule['gameday'] + ' ' + schedule['gametime'], errors='coerce')
+    return kickoff.dt.tz_localize(GAME_TZ, ambiguous='NaT', nonexistent='shift_forward')
+
+def _pending_games(schedule, final_games):
+    """Games that have kicked off (or have a score) but are not yet cached as final."""
+    if schedule.empty:
+        return set()
+    started = (_kickoffs(schedule) <= pd.Timestamp.now(tz=GAME_TZ)) | schedule['home_score'].notnull()
+    return set(schedule.loc[started & ~schedule['game_id'].isin(final_games), 'game_id'])
+
+def _settled_games(schedule, published):
+    """
+    Finished games whose PBP came from a release published at least PBP_SETTLE_HOURS after kickoff,
+    so a release cut mid-game (or before stat corrections) never freezes a game in the cache.
+    Without a release timestamp nothing is marked final and the games are simply re-merged next release.
+    """
+    if schedule.empty or published is None:
+        return set()
+    settled = _kickoffs(schedule) + pd.Timedelta(hours=PBP_SETTLE_HOURS) <= published
+    return set(schedule.loc[settled & schedule['home_score'].notnull(), 'game_id'])
+
+def _remote_version(season):
+    """
+    (version, published) of the season release file: ETag / Last-Modified as the version and
+    Last-Modified as a tz-aware timestamp (None when missing). A HEAD request is far cheaper than the download.
+    """
+    try:
+        resp = requests.head(PBP_URL.format(season=season), allow_redirects=True, timeout=10)
+        if resp.status_code == 200:
+            modified = resp.headers.get('Last-Modified')
+            published = pd.Timestamp(parsedate_to_datetime(modified)) if modified else None
+            return resp.headers.get('ETag') or modified, published
+    except Exception as e:
+        print(f"   ⚠️ Could not check PBP release version: {e}")
+    return None, None
+
+def _read_release(season, columns, timeout=120):
+    """
+    Downloads the season release file and decodes only the declared columns (read-time projection),
+    so the ~370 columns nflverse ships are never materialized.
+    """
+    resp = requests.get(PBP_URL.format(season=season), timeout=timeout)
+    resp.raise_for_status()
+    source = pq.ParquetFile(io.BytesIO(resp.content))
+    present = [c for c in columns if c in source.schema_arrow.names]
+    return source.read(columns=present).to_pandas()
+
+def load_pbp_cached(season, schedule, cache_dir=CACHE_DIR, columns=None, deadline=None):
+    """
+    Loads a season of play-by-play from a week-partitioned Parquet cache.
+    Settled games (finished, and merged from a release published PBP_SETTLE_HOURS after kickoff)
+    are stored once and never downloaded again. The season file is only fetched when a game is new,
+    in progress or not yet settled AND the upstream release has changed, and only the week
+    partitions containing those games are rewritten.
+    Only the declared column manifest is read from the release (see engine/columns.py).
+    """
+    columns = columns or required_pbp_columns()
+    season_dir = _season_dir(season, cache_dir)
+    manifest = _load_manifest(season_dir)
+    cached = _read_partitions(season_dir)
+
+    # A manifest that grew since the cache was written means the partitions lack columns
+    if not cached.empty and not set(columns) <= set(manifest.get('columns', [])):
+        print("   ⚠️ PBP column manifest changed, rebuilding cache.")
+        cached = pd.DataFrame()
+    final_games = set(manifest.get('final_games', [])) if not cached.empty else set()
+
+    pending = _pending_games(schedule, final_games)
+    if not cached.empty and not pending:
+        print(f"   ✅ PBP cache hit: {len(final_games)} finished games, nothing pending.")
+        return project_pbp(cached, columns)
+
+    version, published = _remote_version(season)
+    if not cached.empty and version is not None and version == manifest.get('version'):
+        print(f"   ✅ PBP release unchanged; {len(pending)} pending or unsettled games have nothing new.")
+        return project_pbp(cached, columns)
+
+    # Socket timeout bounded by the caller's budget so a stalled download gives up on its own
+    timeout = max(5, deadline - time.monotonic()) if deadline is not None else 120
+    fresh = load_data_with_retry(lambda: _read_release(season, columns, timeout), "PBP", deadline=deadline)
+    fresh = project_pbp(fresh, columns)
+
+    # Only games we don't already hold as final get merged in
+    incoming = fresh[~fresh['game_id'].isin(final_games)]
+    os.makedirs(season_dir, exist_ok=True)
+
+    merged_weeks = []
+    for week, week_plays in incoming.groupby('week'):
+        existing = cached[cached['week'] == week] if not cached.empty else pd.DataFrame()
+        if not existing.empty:
+            existing = existing[~existing['game_id'].isin(week_plays['game_id'])]
+        partition = pd.concat([existing, week_plays], ignore_index=True)
+        _write_partition(season_dir, week, partition)
+        merged_weeks.append(partition)
+
+    final_games |= set(incoming['game_id']) & _settled_games(schedule, published)
+
+    _save_manifest(season_dir, {"version": version, "final_games": sorted(final_games), "columns": columns})
+    print(f"   💾 PBP cache: merged {incoming['game_id'].nunique()} games across {len(merged_weeks)} week(s).")
+
+    untouched = cached[~cached['week'].isin(incoming['week'].unique())] if not cached.empty else pd.DataFrame()
+    return project_pbp(pd.concat([untouched] + merged_weeks, ignore_index=True), columns)
@@ -0,0 +1,110 @@
+import pandas as pd
+import numpy as np
+from engine.data import round1
+
+INACTIVE_STATUSES = ['OUT', 'CUT', 'Practice Squad', 'IR', 'Inactive']
+
+# Projection blend. engine/tuning.py searches over these same keys.
+PROJECTION_WEIGHTS = {
+    'w_base': 0.50,         # grade-scaled season average
+    'w_off': 0.30,          # offense cap: team points x kicker share
+    'w_def': 0.20,          # defense cap: points allowed x kicker share allowed
+    'grade_scale': 90,      # grade that leaves avg_pts unchanged
+    'share_mult': 1.2,
+    'vegas_weight': 0.7,    # Vegas implied total vs L4 form
+    'form_weight': 0.3,
+    'default_share': 0.45,  # used when a team has no share history
+    'share_cap': 0.80,
+}
+
+def build_matchup_rows(schedule, weeks):
+    """
+    One row per (team, game) for the given weeks: opponent, roof/dome, kickoff, Vegas lines and the
+    team's implied total, home views first then away views.
+    """
+    matchups = schedule[schedule['week'].isin(weeks)][['week', 'home_team', 'away_team', 'roof', 'gameday', 'gametime', 'spread_line', 'total_line']].copy()
+    matchups['game_dt'] = matchups['gameday'] + ' ' + matchups['gametime']
+    matchups['total_line'] = matchups['total_line'].fillna(44.0)
+    matchups['spread_line'] = matchups['spread_line'].fillna(0.0)
+
+    home_view = matchups[['home_team', 'away_team', 'roof', 'game_dt', 'total_line', 'spread_line', 'week']].copy()
+    home_view['home_field'] = home_view['home_team']
+    home_view = home_view.rename(columns={'home_team': 'team', 'away_team': 'opponent'})
+    home_view['vegas_implied'] = (home_view['total_line'] + home_view['spread_line']) / 2
+    home_view['is_home'] = True
+    home_view['spread_display'] = [f"{x*-1:+.1f}" for x in home_view['spread_line']]
+
+    away_view = matchups[['away_team', 'home_team', 'roof', 'game_dt', 'total_line', 'spread_line', 'week']].copy()
+    away_view['home_field'] = away_view['home_team']
+    away_view = away_view.rename(columns={'away_team': 'team', 'home_team': 'opponent'})
+    away_view['vegas_implied'] = (away_view['total_line'] - away_view['spread_line']) / 2
+    away_view['is_home'] = False
+    away_view['spread_display'] = [f"{x:+.1f}" for x in away_view['spread_line']]
+
+    model = pd.concat([home_view, away_view])
+    model['is_dome'] = model['roof'].isin(['dome', 'closed'])
+    return model
+
+def project_kickers(features, lg_off_avg, lg_def_avg, weights=PROJECTION_WEIGHTS):
+    """
+    Columnar grade/projection engine. Works on any feature frame with
+    off_stall_rate, def_stall_rate, is_dome, avg_pts, vegas_implied, off_ppg, def_pa,
+    off_share, def_share, total_line, spread_display and injury_status, so it can be
+    run for many weeks or scenarios in one call.
+    Returns one row per input row (same index) with the grade/projection breakdown.
+    `weights` overrides the blend constants (see PROJECTION_WEIGHTS).
+    """
+    w = {**PROJECTION_WEIGHTS, **weights}
+    def col(name, default=0.0):
+        if name not in features.columns:
+            return np.full(len(features), default, dtype='float64')
+        return features[name].to_numpy(dtype='float64', na_value=np.nan)
+
+    status = features['injury_status'] if 'injury_status' in features.columns else pd.Series('Healthy', index=features.index)
+    inactive = status.isin(INACTIVE_STATUSES).to_numpy()
+    is_dome = features['is_dome'].astype(bool).to_numpy()
+
+    # Stall rates scaled against the league average (40 pts each at average)
+    off_score = col('off_stall_rate') / lg_off_avg * 40 if lg_off_avg else np.full(len(features), 40.0)
+    def_score = col('def_stall_rate') / lg_def_avg * 40 if lg_def_avg else np.full(len(features), 40.0)
+    bonus_val = np.where(is_dome, 10, 0)
+
+    grade = round1(off_score + def_score + bonus_val)
+    base_proj = col('avg_pts') * (grade / w['grade_scale'])
+
+    # RESTORED WEIGHTED MATH
+    vegas = col('vegas_implied')
+    w_team_score = np.where(vegas > 0, vegas * w['vegas_weight'] + col('off_ppg') * w['form_weight'], col('off_ppg'))
+    w_def_allowed = np.where(vegas > 0, vegas * w['vegas_weight'] + col('def_pa') * w['form_weight'], col('def_pa'))
+
+    s_off = col('off_share', w['default_share'])
+    s_off = np.minimum(np.where(s_off > 0, s_off, w['default_share']), w['share_cap'])
+    off_cap = w_team_score * (s_off * w['share_mult'])
+
+    s_def = col('def_share', w['default_share'])
+    s_def = np.minimum(np.where(s_def > 0, s_def, w['default_share']), w['share_cap'])
+    def_cap = w_def_allowed * (s_def * w['share_mult'])
+
+    weighted_proj = (base_proj * w['w_base']) + (off_cap * w['w_off']) + (def_cap * w['w_def'])
+    proj = np.where(weighted_proj > 1.0, round1(weighted_proj), round1(base_proj))
+
+    # Injured / inactive kickers are zeroed out across the board
+    zero = lambda arr: np.where(inactive, 0.0, arr)
+    grade_details = [
+        [f"⛔ {st}"] if out else (["+10 Dome"] if dome else [])
+        for st, out, dome in zip(status, inactive, is_dome)
+    ]
+
+    return pd.DataFrame({
+        'grade': zero(grade),
+        'proj': zero(proj),
+        'grade_details': grade_details,
+        'off_score_val': round1(zero(off_score)),
+        'def_score_val': round1(zero(def_score)),
+        'w_team_score': round1(zero(w_team_score)),
+        'w_def_allowed': round1(zero(w_def_allowed)),
+        'off_cap_val': round1(zero(off_cap)),
+        'def_cap_val': round1(zero(def_cap)),
+        'details_vegas_total': round1(col('total_line')),
+        'details_vegas_spread': features['spread_display'].to_numpy() if 'spread_display' in features.columns else None,
+    }, index=features.index)
@@ -0,0 +1,122 @@
+import pandas as pd
+import numpy as np
+from engine.data import aggregate_kick_counts
+from engine.features import team_features_at
+from engine.projection import project_kickers, build_matchup_rows
+
+# Fantasy points per outcome column, same scoring as the season table in run_engine
+FPTS_WEIGHTS = {
+    'fg_0_19': 3, 'fg_20_29': 3, 'fg_30_39': 3, 'fg_40_49': 4, 'fg_50_59': 5, 'fg_60_plus': 5,
+    'xp_made': 1, 'fg_miss': -1, 'xp_miss': -1,
+}
+
+def kicker_form_before(kick_plays, weeks):
+    """
+    Point-in-time kicker form: for each week W, every kicker's fpts, games and last team
+    from kicks in weeks < W only. One kicker-week aggregation plus cumulative sums over a
+    dense kicker x week grid, so all weeks come out of a single pass.
+    Returns a long frame keyed by (week, kicker_player_id).
+    """
+    weeks = sorted(int(w) for w in weeks)
+    if kick_plays.empty or not weeks:
+        return pd.DataFrame(columns=['week', 'kicker_player_id', 'kicker_player_name', 'team', 'fpts', 'games', 'avg_pts'])
+
+    keys = ['kicker_player_id', 'week']
+    counts = aggregate_kick_counts(kick_plays, keys, list(FPTS_WEIGHTS))
+    counts['fpts'] = sum(counts[c] * w for c, w in FPTS_WEIGHTS.items())
+    per_week = kick_plays.groupby(keys, sort=True).agg(
+        kicker_player_name=('kicker_player_name', 'last'), team=('posteam', 'last'), games=('game_id', 'nunique')
+    ).reset_index()
+    per_week = per_week.merge(counts[keys + ['fpts']], on=keys)
+
+    kickers = pd.Index(per_week['kicker_player_id'].unique())
+    n_weeks = max(weeks[-1], int(per_week['week'].max()))
+    k = kickers.get_indexer(per_week['kicker_player_id'])
+    # Each kicker-week lands one column later, so after the cumulative pass column W covers weeks < W
+    col = per_week['week'].to_numpy(dtype='int64') + 1
+
+    def cumulative(values):
+        grid = np.zeros((len(kickers), n_weeks + 2))
+        grid[k, col] = values
+        return np.cumsum(grid, axis=1)
+
+    fpts = cumulative(per_week['fpts'].to_numpy(dtype='float64'))
+    games = cumulative(per_week['games'].to_numpy(dtype='float64'))
+
+    # Last week with a kick before W -> that week's team and name
+    last_row = np.full((len(kickers), n_weeks + 2), -1)
+    last_row[k, col] = np.arange(len(per_week))
+    last_row = np.maximum.accumulate(last_row, axis=1)
+
+    cols = np.array(weeks)
+    rows = last_row[:, cols].ravel()
+    form = pd.DataFrame({
+        'week': np.tile(cols, len(kickers)),
+        'kicker_player_id': np.repeat(kickers.to_numpy(), len(cols)),
+        'fpts': fpts[:, cols].ravel(),
+        'games': games[:, cols].ravel(),
+        'row': rows,
+    })
+    form = form[form['games'] > 0]
+    form['kicker_player_name'] = per_week['kicker_player_name'].to_numpy()[form['row']]
+    form['team'] = per_week['team'].to_numpy()[form['row']]
+    form['avg_pts'] = (form['fpts'] / form['games']).round(1)
+    return form.drop(columns=['row']).sort_values(['week', 'kicker_player_id']).reset_index(drop=True)
+
+def kicker_week_actuals(kick_plays):
+    """Fantasy points each kicker actually scored, per (week, kicker_player_id)."""
+    counts = aggregate_kick_counts(kick_plays, ['week', 'kicker_player_id'], list(FPTS_WEIGHTS))
+    counts['act'] = sum(counts[c] * w for c, w in FPTS_WEIGHTS.items())
+    return counts[['week', 'kicker_player_id', 'act']]
+
+def replay_features(kick_plays, schedule, team_features, weeks):
+    """
+    Point-in-time model inputs for past weeks: kicker form from earlier weeks, that week's matchup
+    and team features through week W-1 from the feature store, plus the league stall averages the
+    grade is scaled against (lg_off_avg / lg_def_avg). One row per (week, kicker).
+    """
+    weeks = [int(w) for w in weeks if w >= 2]
+    form = kicker_form_before(kick_plays, weeks)
+    matchups = build_matchup_rows(schedule, weeks)
+    frames = []
+
+    for week, kickers in form.groupby('week', sort=True):
+        asof = week - 1
+        features = kickers.merge(matchups[matchups['week'] == week].drop(columns=['week']), on='team', how='inner')
+        if features.empty:
+            continue
+
+        off_stall = team_features_at(team_features, asof, 'off_stall_rate')
+        def_stall = team_features_at(team_features, asof, 'def_stall_rate', key='opponent')
+        for frame, key in [
+            (off_stall, 'team'), (team_features_at(team_features, asof, 'off_ppg'), 'team'),
+            (team_features_at(team_features, asof, 'off_share'), 'team'), (def_stall, 'opponent'),
+            (team_features_at(team_features, asof, 'def_pa', key='opponent'), 'opponent'),
+            (team_features_at(team_features, asof, 'def_share', key='opponent'), 'opponent'),
+        ]:
+            features = features.merge(frame, on=key, how='left')
+        features = features.drop_duplicates(subset=['kicker_player_id']).fillna(0)
+        features['week'] = week
+        features['lg_off_avg'] = off_stall['off_stall_rate'].mean()
+        features['lg_def_avg'] = def_stall['def_stall_rate'].mean()
+        frames.append(features)
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def replay_projections(kick_plays, schedule, team_features, weeks):
+    """
+    Regenerates run_analysis projections for past weeks using only what was known before kickoff
+    (see replay_features). Live-only inputs (injury reports, roster moves, weather) are not
+    replayed; every kicker is treated as healthy.
+    Returns the replay features with grade and proj appended.
+    """
+    features = replay_features(kick_plays, schedule, team_features, weeks)
+    if features.empty:
+        return pd.DataFrame(columns=['week', 'kicker_player_id', 'grade', 'proj'])
+
+    graded = []
+    for week, rows in features.groupby('week', sort=True):
+        projected = project_kickers(rows, rows['lg_off_avg'].iat[0], rows['lg_def_avg'].iat[0])
+        graded.append(projected[['grade', 'proj']])
+    print(f"   🔁 Replayed projections for {len(graded)} weeks.")
+    return features.join(pd.concat(graded))
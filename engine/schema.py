@@ -0,0 +1,138 @@
+import typing
+from typing import Optional
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# --- PUBLISHED OUTPUT SCHEMA ---
+# The fields each `rankings` record ships with, in output order. Everything else on the
+# frame (merge keys, raw weather tuples, CBS flags, raw Vegas lines...) stays internal.
+class RankingRecord(BaseModel):
+    # Identity
+    kicker_player_name: str
+    kicker_player_id: str
+    team: str
+    join_name: Optional[str] = None  # Sleeper roster matching
+    headshot_url: Optional[str] = None
+
+    # Season counts
+    fg_made: int = 0
+    fg_att: int = 0
+    fg_0_19: int = 0
+    fg_20_29: int = 0
+    fg_30_39: int = 0
+    fg_40_49: int = 0
+    fg_50_59: int = 0
+    fg_60_plus: int = 0
+    fg_miss: int = 0
+    fg_miss_0_19: int = 0
+    fg_miss_20_29: int = 0
+    fg_miss_30_39: int = 0
+    fg_miss_40_49: int = 0
+    fg_miss_50_59: int = 0
+    fg_miss_60_plus: int = 0
+    xp_made: int = 0
+    xp_miss: int = 0
+    games: int = 0
+    rz_trips: int = 0
+    acc: Optional[float] = None
+    dome_pct: Optional[float] = None
+    fpts: Optional[float] = None
+    avg_pts: Optional[float] = None
+
+    # Availability
+    status: Optional[str] = None
+    roster_status: Optional[str] = None
+    own_pct: Optional[float] = None
+    injury_status: Optional[str] = None
+    injury_color: Optional[str] = None
+    injury_details: Optional[str] = None
+
+    # Matchup
+    opponent: Optional[str] = None
+    game_dt: Optional[str] = None
+    vegas_implied: Optional[float] = None
+    is_dome: bool = False
+    weather_desc: Optional[str] = None
+
+    # Current week (live scoring)
+    wk_fg_0_19: int = 0
+    wk_fg_20_29: int = 0
+    wk_fg_30_39: int = 0
+    wk_fg_40_49: int = 0
+    wk_fg_50_59: int = 0
+    wk_fg_60_plus: int = 0
+    wk_fg_miss: int = 0
+    wk_xp_made: int = 0
+    wk_xp_miss: int = 0
+    wk_fg_miss_0_19: int = 0
+    wk_fg_miss_20_29: int = 0
+    wk_fg_miss_30_39: int = 0
+    wk_fg_miss_40_49: int = 0
+    wk_fg_miss_50_59: int = 0
+    wk_fg_miss_60_plus: int = 0
+
+    # Model inputs and output
+    off_stall_rate: Optional[float] = None
+    off_ppg: Optional[float] = None
+    off_share: Optional[float] = None
+    def_stall_rate: Optional[float] = None
+    def_pa: Optional[float] = None
+    grade: Optional[float] = None
+    proj: Optional[float] = None
+    grade_details: list = []
+    off_score_val: Optional[float] = None
+    def_score_val: Optional[float] = None
+    w_team_score: Optional[float] = None
+    w_def_allowed: Optional[float] = None
+    off_cap_val: Optional[float] = None
+    def_cap_val: Optional[float] = None
+    details_vegas_total: Optional[float] = None
+    details_vegas_spread: Optional[str] = None
+    history: dict = {}
+    narrative: Optional[str] = None
+
+def _base_type(annotation):
+    """int / float / str / bool behind an Optional[...], anything else as-is."""
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    return args[0] if typing.get_origin(annotation) is typing.Union and len(args) == 1 else annotation
+
+def _numbers(col):
+    values = pd.to_numeric(col, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return values, np.isfinite(values)
+
+def _column_values(col, kind, default):
+    """One column as a JSON-ready list typed per the schema; NaN/inf/filler become the field default."""
+    if kind is int:
+        values, ok = _numbers(col)
+        out = np.where(ok, values, 0).astype('int64').tolist()
+    elif kind is float:
+        values, ok = _numbers(col)
+        out = values.tolist()
+    elif kind is bool:
+        return col.fillna(default).astype(bool).tolist()
+    elif kind is str:
+        # Non-strings in a text column are frame-wide fillna(0) filler, not values
+        return [v if isinstance(v, str) else default for v in col.tolist()]
+    else:
+        return col.tolist()
+    if not ok.all():
+        out = [v if good else default for v, good in zip(out, ok)]
+    return out
+
+def records_from_columns(frame, model=RankingRecord):
+    """
+    Serializes `frame` to a list of dicts with exactly the model's fields, in its order.
+    Works column by column on the arrays (one typed conversion per field) and zips the
+    rows at the end, instead of replace/where/to_dict passes over the whole frame.
+    Columns missing from the frame are filled with the field default.
+    """
+    names, columns = [], []
+    for name, field in model.model_fields.items():
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        if name in frame.columns:
+            columns.append(_column_values(frame[name], _base_type(field.annotation), default))
+        else:
+            columns.append([default] * len(frame))
+        names.append(name)
+    return [dict(zip(names, row)) for row in zip(*columns)]
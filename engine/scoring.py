@@ -0,0 +1,53 @@
+import pandas as pd
+import numpy as np
+from engine.data import KICK_COUNT_COLS
+
+# Scoring presets, keyed like the count columns. fg_miss is the generic miss penalty; the
+# fg_miss_<bucket> entries override it for misses with a known distance.
+SCORING_PRESETS = {
+    'standard': {
+        'fg_0_19': 3, 'fg_20_29': 3, 'fg_30_39': 3, 'fg_40_49': 4, 'fg_50_59': 5, 'fg_60_plus': 5,
+        'xp_made': 1, 'xp_miss': -1, 'fg_miss': -1,
+    },
+    'distance_tiered': {
+        'fg_0_19': 3, 'fg_20_29': 3, 'fg_30_39': 3, 'fg_40_49': 4, 'fg_50_59': 5, 'fg_60_plus': 6,
+        'xp_made': 1, 'xp_miss': -1, 'fg_miss': -1,
+        'fg_miss_0_19': -2, 'fg_miss_20_29': -2, 'fg_miss_50_59': 0, 'fg_miss_60_plus': 0,
+    },
+    'harsh_miss': {
+        'fg_0_19': 3, 'fg_20_29': 3, 'fg_30_39': 3, 'fg_40_49': 4, 'fg_50_59': 5, 'fg_60_plus': 5,
+        'xp_made': 1, 'xp_miss': -2, 'fg_miss': -2,
+        'fg_miss_0_19': -3, 'fg_miss_20_29': -3, 'fg_miss_50_59': -1, 'fg_miss_60_plus': -1,
+    },
+}
+
+# Presets that need the exact kick distance, scored from the 1-yard histograms (engine/distance.py)
+DISTANCE_PRESETS = {
+    # 0.1 pts per yard
+    'per_yard': {'made': lambda yards: 0.1 * yards, 'miss': -1, 'xp_made': 1, 'xp_miss': -1},
+}
+
+# Every published preset: bucket presets first, then distance presets. A name lives in exactly one of the two.
+PRESET_NAMES = list(SCORING_PRESETS) + list(DISTANCE_PRESETS)
+
+def preset_matrix(presets=SCORING_PRESETS):
+    """
+    (count column x preset) weight matrix over KICK_COUNT_COLS. Miss buckets carry the difference
+    from the generic fg_miss weight, so misses without a distance still get the generic penalty
+    and nothing is counted twice.
+    """
+    weights = np.zeros((len(KICK_COUNT_COLS), len(presets)))
+    for j, preset in enumerate(presets.values()):
+        generic = preset.get('fg_miss', 0)
+        for i, col in enumerate(KICK_COUNT_COLS):
+            weights[i, j] = preset.get(col, generic) - generic if col.startswith('fg_miss_') else preset.get(col, 0)
+    return weights
+
+def score_presets(counts, presets=SCORING_PRESETS, prefix=''):
+    """Fantasy points for every preset in one (rows x counts) @ (counts x presets) product."""
+    matrix = counts.reindex(columns=[prefix + c for c in KICK_COUNT_COLS]).fillna(0).to_numpy(dtype='float64')
+    return pd.DataFrame(matrix @ preset_matrix(presets), columns=list(presets), index=counts.index)
+
+def preset_arrays(ids, points):
+    """Compact column-per-preset payload: {'ids': [...], '<preset>': [pts aligned to ids], ...}."""
+    return {'ids': list(ids), **{name: points[name].round(2).tolist() for name in points.columns}}
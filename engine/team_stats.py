@@ -1,112 +1,69 @@
 import pandas as pd
 import numpy as np
+from engine.data import round1
 
-def calculate_team_stats(schedule_df, current_week, window=4):
+def build_team_game_table(schedule_df, current_week):
     """
-    Calculates Offensive PPG (Points Per Game) and Defensive PA (Points Allowed)
-    for each team over the last `window` weeks. Used for the main engine logic.
+    Long table with one row per (team, game): both perspectives of every game stacked in one shot.
+    Scales to multi-season schedules without a Python loop.
     """
-    if schedule_df.empty:
-        return pd.DataFrame(), pd.DataFrame()
-
-    # Filter for completed games in the window leading up to current week
-    # We look at games from (current_week - window) to (current_week - 1)
-    start_week = max(1, current_week - window)
-    completed = schedule_df[
-        (schedule_df['week'] >= start_week) & 
-        (schedule_df['week'] < current_week) & 
-        (schedule_df['home_score'].notnull())
-    ].copy()
+    # Include current week to show vegas lines even if score isn't final
+    games = schedule_df[schedule_df['week'] <= current_week]
+    n = len(games)
 
-    if completed.empty:
-        # Return empty dataframes with correct columns if no data
-        return pd.DataFrame(columns=['team', 'off_ppg']), pd.DataFrame(columns=['team', 'def_pa'])
+    # Vegas Implied Totals
+    # NOTE: nflreadpy spread_line is usually "Home Team Spread". Negative means Home is favorite.
+    # Home = (Total - Spread) / 2  -- e.g. (45 - (-3))/2 = 24
+    # Away = (Total + Spread) / 2  -- e.g. (45 + (-3))/2 = 21
+    total = games['total_line'].fillna(0).to_numpy(dtype='float64')
+    spread = games['spread_line'].fillna(0).to_numpy(dtype='float64')
+    home_score = games['home_score'].to_numpy(dtype='float64', na_value=np.nan)
+    away_score = games['away_score'].to_numpy(dtype='float64', na_value=np.nan)
 
-    # 1. Calculate Offensive Points (PPG)
-    # We need to stack home and away scores to get a single list of (Team, Points Scored)
-    home_scores = completed[['home_team', 'home_score']].rename(columns={'home_team': 'team', 'home_score': 'pts'})
-    away_scores = completed[['away_team', 'away_score']].rename(columns={'away_team': 'team', 'away_score': 'pts'})
-    all_scores = pd.concat([home_scores, away_scores])
-    
-    off_ppg = all_scores.groupby('team')['pts'].mean().reset_index().rename(columns={'pts': 'off_ppg'})
-    off_ppg['off_ppg'] = off_ppg['off_ppg'].round(1)
+    table = pd.DataFrame({
+        'team': np.concatenate([games['home_team'].to_numpy(), games['away_team'].to_numpy()]),
+        'game_id': np.tile(games['game_id'].to_numpy(), 2),
+        'week': np.tile(games['week'].to_numpy(dtype='int64'), 2),
+        'pts': np.concatenate([home_score, away_score]),
+        'pa': np.concatenate([away_score, home_score]),
+        'vegas_implied': round1(np.concatenate([(total - spread) / 2, (total + spread) / 2])),
+        'opponent': np.concatenate([games['away_team'].to_numpy(), games['home_team'].to_numpy()]),
+        'is_home': np.repeat([True, False], n),
+        'game_order': np.tile(np.arange(n), 2),
+    })
+    table = table[table['team'].notna()]
+    return table.sort_values('game_order', kind='stable').reset_index(drop=True)
 
-    # 2. Calculate Defensive Points Allowed (PA)
-    # We need to stack home (allowed away score) and away (allowed home score)
-    home_allowed = completed[['home_team', 'away_score']].rename(columns={'home_team': 'team', 'away_score': 'pts_allowed'})
-    away_allowed = completed[['away_team', 'home_score']].rename(columns={'away_team': 'team', 'home_score': 'pts_allowed'})
-    all_allowed = pd.concat([home_allowed, away_allowed])
-    
-    def_pa = all_allowed.groupby('team')['pts_allowed'].mean().reset_index().rename(columns={'pts_allowed': 'def_pa'})
-    def_pa['def_pa'] = def_pa['def_pa'].round(1)
+def build_team_share_table(team_games, kicks):
+    """
+    Team-game feature table for completed games: points scored, kicker points and the
+    kicker share of points (safe division, 0 when the team was shut out).
+    `team_games` comes from build_team_game_table, `kicks` from build_kick_features.
+    """
+    played = team_games[team_games['pts'].notna()]
+    kicker_pts = kicks.groupby(['game_id', 'posteam'])['real_pts'].sum().rename('kicker_pts')
+    table = played.merge(kicker_pts, left_on=['game_id', 'team'], right_index=True, how='left')
+    table['kicker_pts'] = table['kicker_pts'].fillna(0)
 
-    return off_ppg, def_pa
+    pts = table['pts'].to_numpy(dtype='float64')
+    table['share'] = np.divide(table['kicker_pts'].to_numpy(dtype='float64'), pts, out=np.zeros(len(table)), where=pts > 0)
+    return table
 
 def get_weekly_team_stats(schedule_df, current_week):
     """
     Generates a dictionary of weekly stats for every team up to the current week.
-    Returns: { "DAL": [{ "week": 1, "pts": 33, "pa": 17, "vegas": 44.5 }, ...], ... }
+    Returns: { "DAL": [{ "week": 1, "pts": 33, "pa": 17, "vegas_implied": 44.5, ... }, ...], ... }
     """
     if schedule_df.empty:
         return {}
-        
-    # Filter for all completed games or games with lines up to current week
-    # We include current week to show vegas lines even if score isn't final
-    games = schedule_df[schedule_df['week'] <= current_week].copy()
-    
-    team_stats = {}
-    
-    # Initialize dict for all teams found in schedule
-    all_teams = set(games['home_team'].unique()) | set(games['away_team'].unique())
-    for team in all_teams:
-        if pd.notna(team):
-            team_stats[team] = []
 
-    for _, game in games.iterrows():
-        wk = int(game['week'])
-        home = game['home_team']
-        away = game['away_team']
-        
-        # Vegas Implied Totals
-        total = game['total_line'] if pd.notna(game['total_line']) else 0
-        spread = game['spread_line'] if pd.notna(game['spread_line']) else 0
-        
-        # Calculate implied points (approximated based on spread)
-        # If spread is -3 for Home, Home is favored by 3.
-        # Home Implied = (Total / 2) + (Spread / 2) ? No, spread is usually negative for favorite.
-        # Standard formula: Favorite = (Total - Spread)/2 ? No.
-        # If Spread is -3 (Home Favored), Home Score > Away Score.
-        # Home = (Total - Spread) / 2  -- e.g. (45 - (-3))/2 = 24
-        # Away = (Total + Spread) / 2  -- e.g. (45 + (-3))/2 = 21
-        # NOTE: nflreadpy spread_line is usually "Home Team Spread". Negative means Home is favorite.
-        
-        home_implied = (total - spread) / 2
-        away_implied = (total + spread) / 2
-        
-        # Actual Scores (if available)
-        home_score = game['home_score'] if pd.notna(game['home_score']) else None
-        away_score = game['away_score'] if pd.notna(game['away_score']) else None
-        
-        # Add Home Record
-        if home in team_stats:
-            team_stats[home].append({
-                "week": wk,
-                "pts": home_score,
-                "pa": away_score,
-                "vegas_implied": round(home_implied, 1),
-                "opponent": away,
-                "is_home": True
-            })
-            
-        # Add Away Record
-        if away in team_stats:
-            team_stats[away].append({
-                "week": wk,
-                "pts": away_score,
-                "pa": home_score,
-                "vegas_implied": round(away_implied, 1),
-                "opponent": home,
-                "is_home": False
-            })
-            
-    return team_stats
\ No newline at end of file
+    table = build_team_game_table(schedule_df, current_week)
+    records = table[['team', 'week', 'pts', 'pa', 'vegas_implied', 'opponent', 'is_home']].astype({'pts': object, 'pa': object})
+    # Unplayed games serialize as null, not NaN
+    records['pts'] = records['pts'].where(table['pts'].notna(), None)
+    records['pa'] = records['pa'].where(table['pa'].notna(), None)
+
+    return {
+        team: games.drop(columns=['team']).to_dict(orient='records')
+        for team, games in records.groupby('team', sort=True)
+    }
@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+import itertools
+from engine.projection import PROJECTION_WEIGHTS
+
+# Default search space. form_weight is tied to 1 - vegas_weight.
+WEIGHT_GRID = {
+    'w_base': [0.3, 0.4, 0.5, 0.6, 0.7],
+    'w_off': [0.1, 0.2, 0.3, 0.4],
+    'w_def': [0.1, 0.2, 0.3, 0.4],
+    'grade_scale': [80, 90, 100],
+    'share_mult': [1.0, 1.1, 1.2, 1.3],
+    'vegas_weight': [0.5, 0.6, 0.7, 0.8, 0.9],
+    'default_share': [0.35, 0.45, 0.55],
+    'share_cap': [0.7, 0.8, 0.9],
+}
+
+def weight_grid(grid=WEIGHT_GRID, include_current=True):
+    """Cartesian product of the grid as one array per weight (row 0 = PROJECTION_WEIGHTS if included)."""
+    names = list(grid)
+    combos = np.array(list(itertools.product(*(grid[n] for n in names))), dtype='float64')
+    if include_current:
+        combos = np.vstack([[PROJECTION_WEIGHTS[n] for n in names], combos])
+    params = {n: combos[:, i] for i, n in enumerate(names)}
+    if 'form_weight' not in params:
+        params['form_weight'] = 1 - params['vegas_weight']
+        if include_current:
+            params['form_weight'][0] = PROJECTION_WEIGHTS['form_weight']
+    return params
+
+def _average_ranks(values):
+    """Row-wise ranks (ties get their average rank) for a 2-D array."""
+    order = np.argsort(values, axis=1, kind='stable')
+    ordered = np.take_along_axis(values, order, axis=1)
+    n = values.shape[1]
+    idx = np.broadcast_to(np.arange(n), values.shape)
+
+    run_start = np.ones(values.shape, dtype=bool)
+    run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    run_end = np.ones(values.shape, dtype=bool)
+    run_end[:, :-1] = run_start[:, 1:]
+    start = np.maximum.accumulate(np.where(run_start, idx, 0), axis=1)
+    end = np.minimum.accumulate(np.where(run_end, idx, n - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, (start + end) / 2 + 1, axis=1)
+    return ranks
+
+def _spearman(proj, act):
+    """Spearman correlation of every row of proj (combos x kickers) against act (kickers)."""
+    rp = _average_ranks(proj)
+    ra = _average_ranks(act[None, :])
+    rp -= rp.mean(axis=1, keepdims=True)
+    ra -= ra.mean()
+    denom = np.sqrt((rp ** 2).sum(axis=1) * (ra ** 2).sum())
+    return np.divide((rp * ra).sum(axis=1), denom, out=np.full(len(rp), np.nan), where=denom > 0)
+
+def evaluate_weights(replay, params, chunk=512):
+    """
+    Scores every weight combination against actuals from backfill replay artifacts.
+    The projection is broadcast as (combos x kicker-weeks) in chunks of `chunk` combos, with the
+    same math as project_kickers. Reports MAE over all kicker-weeks and the mean within-week
+    Spearman rank correlation (ranking each week's kickers is what start/sit decisions use).
+    Returns one row per combination, best MAE first.
+    """
+    rows = replay[replay['act'].notna()].reset_index(drop=True)
+    col = lambda name: rows[name].to_numpy(dtype='float64')[None, :]
+    avg_pts, grade, vegas, act = col('avg_pts'), col('grade'), col('vegas_implied'), col('act')
+    off_ppg, def_pa, off_share, def_share = col('off_ppg'), col('def_pa'), col('off_share'), col('def_share')
+
+    week_keys = ['season', 'week'] if 'season' in rows.columns else ['week']
+    weeks = [idx.to_numpy() for _, idx in rows.groupby(week_keys).groups.items() if len(idx) > 2]
+
+    n_combos = len(next(iter(params.values())))
+    mae = np.empty(n_combos)
+    spearman = np.empty(n_combos)
+
+    for lo in range(0, n_combos, chunk):
+        p = {k: v[lo:lo + chunk, None] for k, v in params.items()}
+        base = avg_pts * (grade / p['grade_scale'])
+        w_team = np.where(vegas > 0, vegas * p['vegas_weight'] + off_ppg * p['form_weight'], off_ppg)
+        w_def = np.where(vegas > 0, vegas * p['vegas_weight'] + def_pa * p['form_weight'], def_pa)
+        s_off = np.minimum(np.where(off_share > 0, off_share, p['default_share']), p['share_cap'])
+        s_def = np.minimum(np.where(def_share > 0, def_share, p['default_share']), p['share_cap'])
+        weighted = base * p['w_base'] + (w_team * (s_off * p['share_mult'])) * p['w_off'] + (w_def * (s_def * p['share_mult'])) * p['w_def']
+        proj = np.round(np.where(weighted > 1.0, weighted, base), 1)
+
+        mae[lo:lo + chunk] = np.abs(proj - act).mean(axis=1)
+        spearman[lo:lo + chunk] = np.nanmean(
+            np.column_stack([_spearman(proj[:, idx], act[0, idx]) for idx in weeks]), axis=1
+        ) if weeks else np.nan
+
+    results = pd.DataFrame({k: v for k, v in params.items()})
+    results['mae'] = mae.round(4)
+    results['spearman'] = spearman.round(4)
+    return results.sort_values(['mae', 'spearman'], ascending=[True, False], kind='stable')
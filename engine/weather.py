@@ -1,57 +1,197 @@
 import requests
 import time
+import json
+import os
+import pandas as pd
 from datetime import datetime
-from engine.config import STADIUM_COORDS
+from engine.config import STADIUM_COORDS, CACHE_DIR, WEATHER_TTL_TIERS, GAME_TZ
 
-def get_weather_forecast(home_team, game_dt_str, is_dome=False):
-    # 1. Check if Game is Finished
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+OPEN_METEO_HOURLY = "temperature_2m,precipitation_probability,wind_speed_10m"
+OPEN_METEO_BATCH = 50 # Locations per request; a full slate is ~16 stadiums
+WEATHER_CACHE_FILE = os.path.join(CACHE_DIR, "weather", "forecasts.json")
+
+# Per-run forecast memo: { (lat, lon): { 'YYYY-MM-DDTHH': (wind, precip, temp) } or None }
+# Keyed by coordinates so shared stadiums (LA/LAC, NYG/NYJ) are fetched once.
+_FORECASTS = {}
+
+def reset_weather_cache():
+    """Clears the per-run forecast memo."""
+    _FORECASTS.clear()
+
+# --- DISK CACHE ---
+# { "lat,lon": { 'YYYY-MM-DDTHH': [wind, precip, temp, fetched_epoch] } }
+
+def _now():
+    """Current time in the game timezone; kickoffs and Open-Meteo hour keys are Eastern wall time."""
+    return pd.Timestamp.now(tz=GAME_TZ)
+
+def _disk_key(coords):
+    return f"{coords[0]},{coords[1]}"
+
+def _load_disk_cache(path=WEATHER_CACHE_FILE):
     try:
-        game_dt = datetime.strptime(game_dt_str, '%Y-%m-%d %H:%M')
-        time_diff = datetime.now() - game_dt
-        if time_diff.total_seconds() > (4 * 3600): 
-             return 0, "Game Finished"
-    except: pass
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"   ⚠️ Could not read forecast cache: {e}")
+    return {}
 
-    # 2. Check Dome Status
-    if is_dome: return 0, "Dome"
+def _save_disk_cache(cache, path=WEATHER_CACHE_FILE):
+    # Drop hours that kicked off more than a day ago
+    cutoff = (_now() - pd.Timedelta(days=1)).strftime('%Y-%m-%dT%H')
+    pruned = {k: {h: v for h, v in hours.items() if h >= cutoff} for k, hours in cache.items()}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(pruned, f)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print(f"   ⚠️ Could not write forecast cache: {e}")
 
-    # 3. Robust API Fetch
-    coords = STADIUM_COORDS.get(home_team)
-    if not coords: return 0, "Outdoors ☀️" 
-    
-    lat, lon = coords
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&hourly=temperature_2m,precipitation_probability,wind_speed_10m&temperature_unit=fahrenheit&wind_speed_unit=mph&timezone=America%2FNew_York"
+def _disk_table(cache, coords):
+    hours = cache.get(_disk_key(coords))
+    return {h: tuple(v[:3]) for h, v in hours.items()} if hours else None
+
+def forecast_ttl_hours(hours_to_kickoff):
+    """Long TTL for games days away, short TTL close to kickoff."""
+    for above, ttl in WEATHER_TTL_TIERS:
+        if hours_to_kickoff > above: return ttl
+    return WEATHER_TTL_TIERS[-1][1]
+
+def _request_forecasts(label, coords_list):
+    """
+    One Open-Meteo call for any number of locations (comma-separated lat/lon lists).
+    Returns a list of per-location payloads in the same order, or None.
+    """
+    params = {
+        'latitude': ",".join(str(lat) for lat, _ in coords_list),
+        'longitude': ",".join(str(lon) for _, lon in coords_list),
+        'hourly': OPEN_METEO_HOURLY,
+        'temperature_unit': 'fahrenheit',
+        'wind_speed_unit': 'mph',
+        'timezone': GAME_TZ,
+    }
     
-    data = None
     # Retry up to 4 times with exponential backoff (1s, 2s, 4s, 8s)
     for attempt in range(4):
         try:
-            resp = requests.get(url, timeout=5)
+            resp = requests.get(OPEN_METEO_URL, params=params, timeout=10)
             if resp.status_code == 200:
-                temp_data = resp.json()
-                if 'hourly' in temp_data and 'wind_speed_10m' in temp_data['hourly']:
-                    data = temp_data
-                    break
+                payload = resp.json()
+                # Single location -> object, multiple -> list
+                payload = payload if isinstance(payload, list) else [payload]
+                if len(payload) == len(coords_list) and all('wind_speed_10m' in p.get('hourly', {}) for p in payload):
+                    return payload
         except Exception as e:
-            print(f"   ⚠️ Weather API attempt {attempt+1} failed for {home_team}: {e}")
+            print(f"   ⚠️ Weather API attempt {attempt+1} failed for {label}: {e}")
         
         time.sleep(2 ** attempt)
+    return None
+
+def _fetch_hourly(home_team, lat, lon):
+    payload = _request_forecasts(home_team, [(lat, lon)])
+    return payload[0] if payload else None
+
+def _to_table(hourly):
+    """Open-Meteo hourly arrays -> { hour_prefix: (wind, precip, temp) }."""
+    return {
+        t[:13]: (w, p, tp)
+        for t, w, p, tp in zip(hourly['time'], hourly['wind_speed_10m'], hourly['precipitation_probability'], hourly['temperature_2m'])
+    }
+
+def get_stadium_forecast(home_team):
+    """Hourly forecast table for a stadium, fetched once per run. Failures are memoized too."""
+    coords = STADIUM_COORDS.get(home_team)
+    if not coords: return None
     
-    if not data: return 0, "Outdoors ☀️"
+    if coords not in _FORECASTS:
+        data = _fetch_hourly(home_team, *coords)
+        # API down: a stale forecast beats no forecast
+        _FORECASTS[coords] = _to_table(data['hourly']) if data else _disk_table(_load_disk_cache(), coords)
+    return _FORECASTS[coords]
+
+def get_weekly_forecasts(games):
+    """
+    Batch-fetches every outdoor stadium of the slate in one or two requests and primes the
+    per-run memo, so the per-game lookups below never hit the network.
+    games: frame with home_field, game_dt, is_dome.
+    Returns a long table of (team, hour, wind, precip, temp).
+    """
+    now = _now()
+    kickoff = pd.to_datetime(games['game_dt'], format='%Y-%m-%d %H:%M', errors='coerce')
+    live = games.assign(kickoff=kickoff.dt.tz_localize(GAME_TZ, ambiguous='NaT', nonexistent='shift_forward'))
+    live = live[~live['is_dome'].astype(bool) & ~((now - live['kickoff']).dt.total_seconds() > 4 * 3600)]
+    live = live[live['home_field'].isin(STADIUM_COORDS.keys())]
+    teams = list(live['home_field'].unique())
+    
+    # A stadium is refetched only if one of its game-hours is missing or past its kickoff-aware TTL
+    disk = _load_disk_cache()
+    now_ts = time.time()
+    expired = set()
+    for team, kickoff in zip(live['home_field'], live['kickoff']):
+        coords = STADIUM_COORDS[team]
+        hours_to_kickoff = (kickoff - now).total_seconds() / 3600 if pd.notna(kickoff) else 0
+        entry = disk.get(_disk_key(coords), {}).get(kickoff.strftime('%Y-%m-%dT%H')) if pd.notna(kickoff) else None
+        if entry is None or now_ts - entry[3] > forecast_ttl_hours(hours_to_kickoff) * 3600:
+            expired.add(coords)
+    
+    stadiums = {STADIUM_COORDS[t] for t in teams}
+    for coords in stadiums - expired - set(_FORECASTS):
+        _FORECASTS[coords] = _disk_table(disk, coords)
     
+    todo = sorted(expired - set(_FORECASTS))
+    if len(todo) < len(stadiums):
+        print(f"   ✅ {len(stadiums) - len(todo)} stadium forecasts served from cache.")
+    for i in range(0, len(todo), OPEN_METEO_BATCH):
+        chunk = todo[i:i + OPEN_METEO_BATCH]
+        print(f"   🌐 Fetching {len(chunk)} stadium forecasts in one request...")
+        payload = _request_forecasts(f"{len(chunk)} stadiums", chunk)
+        if not payload:
+            print("   ⚠️ Weather API unavailable, serving cached forecasts where we have them.")
+        for j, coords in enumerate(chunk):
+            if payload:
+                table = _to_table(payload[j]['hourly'])
+                disk[_disk_key(coords)] = {h: [*v, now_ts] for h, v in table.items()}
+                _FORECASTS[coords] = table
+            else:
+                _FORECASTS[coords] = _disk_table(disk, coords)
+    if todo:
+        _save_disk_cache(disk)
+    
+    frames = []
+    for team in teams:
+        table = _FORECASTS.get(STADIUM_COORDS[team])
+        if not table: continue
+        hours = list(table.keys())
+        wind, precip, temp = zip(*table.values())
+        frames.append(pd.DataFrame({'team': team, 'hour': hours, 'wind': wind, 'precip': precip, 'temp': temp}))
+    if not frames:
+        return pd.DataFrame(columns=['team', 'hour', 'wind', 'precip', 'temp'])
+    return pd.concat(frames, ignore_index=True)
+
+def get_weather_forecast(home_team, game_dt_str, is_dome=False):
+    # 1. Check if Game is Finished
+    try:
+        game_dt = pd.Timestamp(datetime.strptime(game_dt_str, '%Y-%m-%d %H:%M')).tz_localize(GAME_TZ)
+        time_diff = _now() - game_dt
+        if time_diff.total_seconds() > (4 * 3600): 
+             return 0, "Game Finished"
+    except: pass
+
+    # 2. Check Dome Status
+    if is_dome: return 0, "Dome"
+
+    # 3. Hourly table for this stadium (fetched at most once per run)
+    table = get_stadium_forecast(home_team)
+    if not table: return 0, "Outdoors ☀️"
+    
+    target = game_dt_str.replace(" ", "T")[:13]
+    if target not in table: return 0, "Outdoors ☀️"
+    
+    wind, precip, temp = table[target]
     try:
-        target = game_dt_str.replace(" ", "T")[:13]
-        times = data['hourly']['time']
-        
-        try:
-            idx = next(i for i, t in enumerate(times) if t.startswith(target))
-        except StopIteration:
-            return 0, "Outdoors ☀️"
-        
-        wind = data['hourly']['wind_speed_10m'][idx]
-        precip = data['hourly']['precipitation_probability'][idx]
-        temp = data['hourly']['temperature_2m'][idx]
-        
         cond = f"{int(wind)}mph"
         if precip > 40: 
             cond += " 🌨️" if temp <= 32 else " 🌧️"
@@ -62,4 +202,4 @@ def get_weather_forecast(home_team, game_dt_str, is_dome=False):
             
         return wind, cond
     except:
-        return 0, "Outdoors ☀️"
\ No newline at end of file
+        return 0, "Outdoors ☀️"
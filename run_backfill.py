@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine.config import CURRENT_SEASON, CACHE_DIR, BACKFILL_DIR, BACKFILL_MAX_WORKERS
+from engine.backfill import backfill_season
+
+def run_season(season, cache_dir, out_dir):
+    """Worker entry point: one season per process. Failures are returned, not raised."""
+    try:
+        return backfill_season(season, cache_dir=cache_dir, out_dir=out_dir)
+    except Exception as e:
+        traceback.print_exc()
+        return {'season': season, 'error': str(e)}
+
+def run_backfill(seasons, workers=None, cache_dir=CACHE_DIR, out_dir=BACKFILL_DIR):
+    print(f"🗂️ Backfilling {len(seasons)} seasons ({seasons[0]}-{seasons[-1]})...")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_season, s, cache_dir, out_dir) for s in seasons]
+        for future in as_completed(futures):
+            summary = future.result()
+            results.append(summary)
+            if 'error' in summary:
+                print(f"   ❌ {summary['season']}: {summary['error']}")
+            else:
+                print(f"   ✅ {summary['season']}: {summary['rows']} kicker-weeks, MAE {summary['mae']}, bias {summary['bias']}")
+
+    results.sort(key=lambda r: r['season'])
+    failed = [r['season'] for r in results if 'error' in r]
+    print(f"✅ Backfill done. Artifacts in {out_dir}/<season>/" + (f" ({len(failed)} failed: {failed})" if failed else ""))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the projection pipeline over past seasons.")
+    parser.add_argument("--start", type=int, default=2010)
+    parser.add_argument("--end", type=int, default=CURRENT_SEASON)
+    parser.add_argument("--workers", type=int, default=min(BACKFILL_MAX_WORKERS, os.cpu_count() or 1),
+                        help="Worker processes. Each holds a season of PBP in memory (a few hundred MB).")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--out-dir", default=BACKFILL_DIR)
+    args = parser.parse_args()
+
+    results = run_backfill(list(range(args.start, args.end + 1)), args.workers, args.cache_dir, args.out_dir)
+    if any('error' in r for r in results):
+        sys.exit(1)
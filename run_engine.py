@@ -6,22 +6,45 @@ import sys
 import traceback
 import random
 import numpy as np
-import os
 from datetime import datetime
 
 # Import our new modules
 from engine.config import CURRENT_SEASON
 from engine.data import (
-    load_data_with_retry, get_current_nfl_week, scrape_cbs_injuries, 
-    scrape_fantasy_ownership, clean_nan, calculate_stall_metrics, 
-    analyze_past_3_weeks_strict, get_kicker_scores_for_week 
+    load_frame_with_retry, get_current_nfl_week, scrape_cbs_injuries, 
+    scrape_fantasy_ownership, clean_nan, analyze_past_3_weeks_strict,
+    build_kick_features, aggregate_kick_counts, KICK_OTHER, KICK_COUNT_COLS, DIST_BUCKETS
 )
-from engine.history import load_history, update_history 
-from engine.weather import get_weather_forecast
-from engine.team_stats import calculate_team_stats, get_weekly_team_stats
+from engine.history import (
+    load_history_shards, rebuild_history, apply_projections, write_history_shards
+)
+from engine.replay import replay_projections
+from engine.pbp_cache import load_pbp_cached
+from engine.acquire import acquire_all
+from engine.drives import load_drive_summary
+from engine.features import build_team_week_features, team_features_at, save_feature_store
+from engine.columns import declare_pbp_columns
+from engine.output import write_json_artifact, write_json_if_changed
+from engine.schema import records_from_columns
+from engine.weather import get_weather_forecast, get_weekly_forecasts, reset_weather_cache
+from engine.team_stats import (
+    get_weekly_team_stats, build_team_game_table, build_team_share_table
+)
+from engine.projection import project_kickers, build_matchup_rows
+from engine.injuries import classify_injuries, INACTIVE_ROSTER_CODES
+from engine.scoring import PRESET_NAMES, DISTANCE_PRESETS, score_presets, preset_arrays
+from engine.distance import build_distance_histograms, score_distance, points_by_kicker
+
+declare_pbp_columns('run_engine', [
+    'week', 'game_id', 'play_id', 'drive', 'posteam', 'down', 'yardline_100', 'roof',
+    'play_type', 'kick_distance', 'field_goal_result', 'extra_point_result',
+    'kicker_player_id', 'kicker_player_name'
+])
 
 # --- NARRATIVE ENGINE ---
-def generate_narrative(row):
+def generate_narrative(row, week=None):
+    # Seeded by player and week: same inputs, same text, so reruns don't churn the output
+    rng = random.Random(f"{row.get('kicker_player_id', '')}:{week}")
     injury_status = row.get('injury_status', 'Healthy')
     if injury_status != 'Healthy':
         return f"Monitor status closely as they are currently listed as {injury_status}. This significantly impacts their viability for Week {row.get('week', '')}."
@@ -47,7 +70,7 @@ def generate_narrative(row):
         f"{name} is a risky option this week.",
         f"Fade {name} if possible."
     ]
-    s1 = random.choice(s1_options)
+    s1 = rng.choice(s1_options)
 
     s2_options = [
         f"The offense has a massive implied total of {vegas:.1f}.",
@@ -57,7 +80,7 @@ def generate_narrative(row):
         f"The matchup is favorable against a porous defense.",
         f"Be cautious, as the team has a low implied total."
     ]
-    s2 = random.choice(s2_options)
+    s2 = rng.choice(s2_options)
     
     return f"{s1} {s2}"
 
@@ -66,68 +89,39 @@ def run_analysis():
         target_week = get_current_nfl_week()
         print(f"🚀 Starting Analysis for Week {target_week}...")
         
-        # 1. Load Data
-        pbp = load_data_with_retry(lambda: nfl.load_pbp(seasons=[CURRENT_SEASON]), "PBP")
-        schedule = load_data_with_retry(lambda: nfl.load_schedules(seasons=[CURRENT_SEASON]), "Schedule")
-        players = load_data_with_retry(lambda: nfl.load_players(), "Players")
-        
-        if hasattr(pbp, "to_pandas"): pbp = pbp.to_pandas()
-        if hasattr(schedule, "to_pandas"): schedule = schedule.to_pandas()
-        if hasattr(players, "to_pandas"): players = players.to_pandas()
+        # 1. Load Data (all sources concurrently; wall-clock = slowest source)
+        # PBP comes from the local week-partitioned cache; only new / in-progress games are refetched
+        sources = acquire_all({
+            'schedule': {'load': lambda deadline: load_frame_with_retry(lambda: nfl.load_schedules(seasons=[CURRENT_SEASON]), "Schedule", deadline), 'timeout': 120},
+            'pbp': {'load': lambda deadline, schedule: load_pbp_cached(CURRENT_SEASON, schedule, deadline=deadline), 'needs': ['schedule'], 'timeout': 240},
+            'players': {'load': lambda deadline: load_frame_with_retry(lambda: nfl.load_players(), "Players", deadline), 'timeout': 180},
+            'rosters': {'load': lambda deadline: load_frame_with_retry(lambda: nfl.load_rosters(seasons=[CURRENT_SEASON]), "Rosters", deadline), 'timeout': 180, 'fallback': pd.DataFrame},
+            'cbs_injuries': {'load': lambda deadline: scrape_cbs_injuries(), 'timeout': 30, 'fallback': pd.DataFrame},
+            'ownership': {'load': lambda deadline: scrape_fantasy_ownership(), 'timeout': 30, 'fallback': pd.DataFrame},
+        })
+        schedule, pbp, players = sources['schedule'], sources['pbp'], sources['players']
+        rosters, cbs_injuries, ownership_data = sources['rosters'], sources['cbs_injuries'], sources['ownership']
         
         # 2. HISTORY MANAGEMENT
-        history = {}
-        history_file = "public/history_data.json"
-        if os.path.exists(history_file):
-            try:
-                with open(history_file, "r") as f:
-                    history = json.load(f).get("history", {})
-            except: pass
-        elif os.path.exists("public/kicker_data.json"):
-             try:
-                with open("public/kicker_data.json", "r") as f:
-                    existing_data = json.load(f)
-                    history = existing_data.get("history", {})
-             except: pass
+        history = load_history_shards()
 
         # Rebuild Full History (W1 to Target)
         print(f"📊 Rebuilding History for Weeks 1 to {target_week}...")
-        for w in range(1, target_week + 1):
-            week_str = str(w)
-            actuals_df = get_kicker_scores_for_week(pbp, w)
-            if not actuals_df.empty:
-                new_records = actuals_df.to_dict(orient='records')
-                if week_str in history:
-                    existing_records = history[week_str]
-                    proj_map = {r['id']: r.get('proj', 0) for r in existing_records}
-                    for record in new_records:
-                        pid = record['id']
-                        if pid in proj_map:
-                            record['proj'] = proj_map[pid]
-                        else:
-                            record['proj'] = 0 
-                history[week_str] = new_records
+        kicks = build_kick_features(pbp)
+        history = rebuild_history(history, kicks, target_week)
         
         # 3. TEAM STATS HISTORY
         print("📊 Generating Team Stats History...")
         team_history = get_weekly_team_stats(schedule, target_week)
         
-        cbs_injuries = scrape_cbs_injuries()
-        ownership_data = scrape_fantasy_ownership()
-        
         # 4. Roster Logic
-        print("   📥 Loading Rosters...")
         try:
-            rosters = load_data_with_retry(lambda: nfl.load_rosters(seasons=[CURRENT_SEASON]), "Rosters")
-            if hasattr(rosters, "to_pandas"): rosters = rosters.to_pandas()
-            
             full_roster = rosters[['gsis_id', 'team', 'status', 'position']].copy()
             full_roster.rename(columns={'gsis_id': 'kicker_player_id', 'team': 'roster_team'}, inplace=True)
             # FIX: DEDUPLICATE ROSTERS
             full_roster = full_roster.drop_duplicates(subset=['kicker_player_id'], keep='first')
             
-            inactive_codes = ['RES', 'NON', 'SUS', 'PUP', 'WAIVED', 'REL', 'CUT', 'RET', 'DEV']
-            inactive_roster = rosters[rosters['status'].isin(inactive_codes)][['gsis_id', 'status']].copy()
+            inactive_roster = rosters[rosters['status'].isin(INACTIVE_ROSTER_CODES)][['gsis_id', 'status']].copy()
             inactive_roster.rename(columns={'status': 'roster_status', 'gsis_id': 'kicker_player_id'}, inplace=True)
             inactive_roster = inactive_roster.drop_duplicates(subset=['kicker_player_id'])
         except: 
@@ -135,54 +129,31 @@ def run_analysis():
             inactive_roster = pd.DataFrame(columns=['kicker_player_id', 'roster_status'])
 
         # --- RAW STATS AGGREGATION ---
-        kick_plays = pbp[pbp['play_type'].isin(['field_goal', 'extra_point'])].copy()
-        kick_plays = kick_plays.dropna(subset=['kicker_player_name'])
-        
-        kick_plays['is_fg'] = kick_plays['play_type'] == 'field_goal'
-        kick_plays['is_xp'] = kick_plays['play_type'] == 'extra_point'
-        kick_plays['made'] = ((kick_plays['is_fg'] & (kick_plays['field_goal_result'] == 'made')) | 
-                              (kick_plays['is_xp'] & (kick_plays['extra_point_result'] == 'good')))
+        # Season totals, weekly history, live week and L4 shares all read the same kick table
+        kick_plays = kicks[kicks['code'] != KICK_OTHER]
         
-        # Granular Buckets
-        kick_plays['fg_0_19'] = (kick_plays['is_fg']) & (kick_plays['made']) & (kick_plays['kick_distance'] < 20)
-        kick_plays['fg_20_29'] = (kick_plays['is_fg']) & (kick_plays['made']) & (kick_plays['kick_distance'].between(20, 29))
-        kick_plays['fg_30_39'] = (kick_plays['is_fg']) & (kick_plays['made']) & (kick_plays['kick_distance'].between(30, 39))
-        kick_plays['fg_40_49'] = (kick_plays['is_fg']) & (kick_plays['made']) & (kick_plays['kick_distance'].between(40, 49))
-        kick_plays['fg_50_59'] = (kick_plays['is_fg']) & (kick_plays['made']) & (kick_plays['kick_distance'].between(50, 59))
-        kick_plays['fg_60_plus'] = (kick_plays['is_fg']) & (kick_plays['made']) & (kick_plays['kick_distance'] >= 60)
-        
-        kick_plays['fg_miss'] = (kick_plays['is_fg']) & (~kick_plays['made']) 
-        kick_plays['fg_miss_0_19'] = (kick_plays['is_fg']) & (~kick_plays['made']) & (kick_plays['kick_distance'] < 20)
-        kick_plays['fg_miss_20_29'] = (kick_plays['is_fg']) & (~kick_plays['made']) & (kick_plays['kick_distance'].between(20, 29))
-        kick_plays['fg_miss_30_39'] = (kick_plays['is_fg']) & (~kick_plays['made']) & (kick_plays['kick_distance'].between(30, 39))
-        kick_plays['fg_miss_40_49'] = (kick_plays['is_fg']) & (~kick_plays['made']) & (kick_plays['kick_distance'].between(40, 49))
-        kick_plays['fg_miss_50_59'] = (kick_plays['is_fg']) & (~kick_plays['made']) & (kick_plays['kick_distance'].between(50, 59))
-        kick_plays['fg_miss_60_plus'] = (kick_plays['is_fg']) & (~kick_plays['made']) & (kick_plays['kick_distance'] >= 60)
+        # One row per drive, cached across runs; every team metric below is a groupby over it
+        drives = load_drive_summary(CURRENT_SEASON, pbp, kicks)
 
-        kick_plays['xp_made'] = (kick_plays['is_xp']) & (kick_plays['made'])
-        kick_plays['xp_miss'] = (kick_plays['is_xp']) & (~kick_plays['made'])
-        kick_plays['real_pts'] = (kick_plays['is_fg'] & kick_plays['made']) * 3 + (kick_plays['is_xp'] & kick_plays['made']) * 1
-        
-        kick_plays['is_dome'] = kick_plays['roof'].isin(['dome', 'closed'])
-        
-        rz_drives = pbp[(pbp['yardline_100'] <= 25) & (pbp['yardline_100'].notnull())][['game_id', 'drive', 'posteam']].drop_duplicates()
-        rz_counts = rz_drives.groupby('posteam').size().reset_index(name='rz_trips')
+        # Team feature store: every (team, week) at once; the model looks rows up instead of re-deriving them
+        max_wk = pbp['week'].max()
+        team_games = build_team_game_table(schedule, schedule['week'].max())
+        team_features = build_team_week_features(team_games, drives, build_team_share_table(team_games, kick_plays))
+        save_feature_store(team_features, CURRENT_SEASON)
+        rz_counts = team_features_at(team_features, max_wk, 'rz_trips', key='posteam')
+        rz_counts = rz_counts[rz_counts['rz_trips'] > 0]
 
-        stats = kick_plays.groupby(['kicker_player_name', 'kicker_player_id']).agg(
+        season_keys = ['kicker_player_name', 'kicker_player_id']
+        kick_totals = kick_plays.groupby(season_keys).agg(
             team=('posteam', 'last'),
-            fg_made=('is_fg', lambda x: (x & kick_plays.loc[x.index, 'made']).sum()),
-            fg_att=('is_fg', 'sum'),
-            fg_0_19=('fg_0_19', 'sum'), fg_20_29=('fg_20_29', 'sum'), fg_30_39=('fg_30_39', 'sum'),
-            fg_40_49=('fg_40_49', 'sum'), fg_50_59=('fg_50_59', 'sum'), fg_60_plus=('fg_60_plus', 'sum'),
-            
-            fg_miss=('fg_miss', 'sum'), 
-            fg_miss_0_19=('fg_miss_0_19', 'sum'), fg_miss_20_29=('fg_miss_20_29', 'sum'), fg_miss_30_39=('fg_miss_30_39', 'sum'),
-            fg_miss_40_49=('fg_miss_40_49', 'sum'), fg_miss_50_59=('fg_miss_50_59', 'sum'), fg_miss_60_plus=('fg_miss_60_plus', 'sum'),
-            
-            xp_made=('xp_made', 'sum'), xp_miss=('xp_miss', 'sum'),
             real_pts=('real_pts', 'sum'), dome_kicks=('is_dome', 'sum'),
             total_kicks=('play_id', 'count'), games=('game_id', 'nunique')
         ).reset_index()
+        kick_counts = aggregate_kick_counts(kick_plays, season_keys, ['fg_made', 'fg_att'] + KICK_COUNT_COLS)
+        stats = pd.merge(kick_totals, kick_counts, on=season_keys)
+        stats = stats[season_keys + ['team', 'fg_made', 'fg_att'] +
+                      [f'fg_{b}' for b in DIST_BUCKETS] + ['fg_miss'] + [f'fg_miss_{b}' for b in DIST_BUCKETS] +
+                      ['xp_made', 'xp_miss', 'real_pts', 'dome_kicks', 'total_kicks', 'games']]
         
         # --- FIX TEAM USING ROSTER DATA & FILTER ---
         if not full_roster.empty:
@@ -194,9 +165,15 @@ def run_analysis():
         stats = pd.merge(stats, rz_counts, left_on='team', right_on='posteam', how='left').fillna(0)
         stats['acc'] = (stats['fg_made'] / stats['fg_att'] * 100).round(1)
         stats['dome_pct'] = (stats['dome_kicks'] / stats['total_kicks'] * 100).round(0)
-        stats['fpts'] = (stats['fg_0_19']*3 + stats['fg_20_29']*3 + stats['fg_30_39']*3 + 
-                         stats['fg_40_49']*4 + stats['fg_50_59']*5 + stats['fg_60_plus']*5 + 
-                         stats['xp_made']*1 - stats['fg_miss']*1 - stats['xp_miss']*1)
+        # Every bucket preset in one matrix product; the model runs on standard scoring
+        season_points = score_presets(stats)
+        # Distance-curve presets are scored on the per-yard histograms and added as their own columns
+        distance_store = build_distance_histograms(kick_plays)
+        distance_points = {name: score_distance(distance_store, **spec) for name, spec in DISTANCE_PRESETS.items()}
+        for name, points in distance_points.items():
+            season_points[name] = points_by_kicker(distance_store, points, stats['kicker_player_id'])
+        stats['fpts'] = season_points['standard']
+        ytd_presets = preset_arrays(stats['kicker_player_id'], season_points)
         stats['avg_pts'] = (stats['fpts'] / stats['games']).round(1)
 
         def normalize_name(val):
@@ -232,118 +209,54 @@ def run_analysis():
         stats = pd.merge(stats, inactive_roster, on='kicker_player_id', how='left')
         
         # --- INJURY META CALCULATION ---
-        def get_injury_meta(row):
-            roster_st = str(row.get('roster_status', '')) if pd.notna(row.get('roster_status', '')) else ""
-            if roster_st in ['RES', 'NON', 'SUS', 'PUP']: return "IR", "red-700", f"Roster: {roster_st}"
-            if roster_st in ['WAIVED', 'REL', 'CUT', 'RET']: return "CUT", "red-700", "Released"
-            if roster_st == 'DEV': return "Practice Squad", "yellow-500", "Roster: Practice Squad"
-            cbs_st = str(row.get('cbs_status', '')).title()
-            cbs_det = str(row.get('cbs_injury', ''))
-            if "Out" in cbs_st or "Ir" in cbs_st or "Inactive" in cbs_st: return "OUT", "red-700", f"{cbs_st} ({cbs_det})"
-            if "Doubtful" in cbs_st: return "Doubtful", "red-400", f"{cbs_st} ({cbs_det})"
-            if "Questionable" in cbs_st: return "Questionable", "yellow-500", f"{cbs_st} ({cbs_det})"
-            return "Healthy", "green", "Active"
-
-        injury_meta = stats.apply(get_injury_meta, axis=1)
-        stats['injury_status'] = [x[0] for x in injury_meta]
-        stats['injury_color'] = [x[1] for x in injury_meta]
-        stats['injury_details'] = [x[2] for x in injury_meta]
+        stats = stats.join(classify_injuries(stats))
 
         qualified = stats[stats['fg_att'] >= 5]
         elite_thresh = qualified['fpts'].quantile(0.80) if not qualified.empty else 100
 
-        max_wk = pbp['week'].max()
-        start_wk = max(1, max_wk - 3)
-        recent_pbp = pbp[pbp['week'] >= start_wk].copy()
-        
         # --- MODULAR TEAM STATS ---
-        off_ppg, def_pa = calculate_team_stats(schedule, target_week)
-        
-        off_stall_l4, def_stall_l4 = calculate_stall_metrics(recent_pbp)
-        # RENAME BEFORE MERGE
-        off_stall_l4 = off_stall_l4.rename(columns={'posteam': 'team', 'off_stall_rate': 'off_stall_rate'})
-        def_stall_l4 = def_stall_l4.rename(columns={'defteam': 'opponent', 'def_stall_rate': 'def_stall_rate'})
-        
+        # PPG/PA: the 4 completed weeks before the target week; drive metrics and shares: the last 4 weeks of PBP
+        off_ppg = team_features_at(team_features, target_week - 1, 'off_ppg')
+        def_pa = team_features_at(team_features, target_week - 1, 'def_pa')
+        off_stall_l4 = team_features_at(team_features, max_wk, 'off_stall_rate')
+        def_stall_l4 = team_features_at(team_features, max_wk, 'def_stall_rate', key='opponent')
+
         lg_off_avg = off_stall_l4['off_stall_rate'].mean()
         lg_def_avg = def_stall_l4['def_stall_rate'].mean()
 
-        fourth_downs = recent_pbp[(recent_pbp['down'] == 4) & (recent_pbp['yardline_100'] <= 30)].copy()
-        fourth_downs['is_go'] = fourth_downs['play_type'].isin(['pass', 'run'])
-        aggression_stats = fourth_downs.groupby('posteam').agg(total_4th_opps=('play_id', 'count'), total_go_attempts=('is_go', 'sum')).reset_index()
-        aggression_stats['aggression_pct'] = (aggression_stats['total_go_attempts'] / aggression_stats['total_4th_opps'] * 100).round(1)
-        aggression_stats = aggression_stats.rename(columns={'posteam': 'team'})
-
-        completed = schedule[(schedule['week'] >= start_wk) & (schedule['home_score'].notnull())].copy()
-        l4_kick_plays = kick_plays[kick_plays['game_id'].isin(completed['game_id'])].copy()
-        kicker_game_pts = l4_kick_plays.groupby(['game_id', 'posteam'])['real_pts'].sum().reset_index()
-        kicker_game_pts.rename(columns={'real_pts': 'kicker_pts'}, inplace=True)
-        home_g = completed[['game_id', 'home_team', 'home_score']].rename(columns={'home_team': 'team', 'home_score': 'total'})
-        away_g = completed[['game_id', 'away_team', 'away_score']].rename(columns={'away_team': 'team', 'away_score': 'total'})
-        all_g = pd.concat([home_g, away_g])
-        share_df = pd.merge(all_g, kicker_game_pts, left_on=['game_id', 'team'], right_on=['game_id', 'posteam'], how='left').fillna(0)
-        share_df['share'] = share_df.apply(lambda x: x['kicker_pts'] / x['total'] if x['total'] > 0 else 0, axis=1)
-        off_share = share_df.groupby('team')['share'].mean().reset_index().rename(columns={'share': 'off_share'})
-        matchup_lookup = schedule[['game_id', 'home_team', 'away_team']]
-        share_df = pd.merge(share_df, matchup_lookup, on='game_id')
-        share_df['opponent'] = share_df.apply(lambda x: x['away_team'] if x['team'] == x['home_team'] else x['home_team'], axis=1)
-        def_share = share_df.groupby('opponent')['share'].mean().reset_index().rename(columns={'share': 'def_share'})
-
-        matchups = schedule[schedule['week'] == target_week][['home_team', 'away_team', 'roof', 'gameday', 'gametime', 'spread_line', 'total_line']].copy()
-        matchups['game_dt'] = matchups['gameday'] + ' ' + matchups['gametime']
-        matchups['total_line'] = matchups['total_line'].fillna(44.0)
-        matchups['spread_line'] = matchups['spread_line'].fillna(0.0)
-        
-        home_view = matchups[['home_team', 'away_team', 'roof', 'game_dt', 'total_line', 'spread_line']].copy()
-        home_view['home_field'] = home_view['home_team']
-        home_view = home_view.rename(columns={'home_team': 'team', 'away_team': 'opponent'})
-        home_view['vegas_implied'] = (home_view['total_line'] + home_view['spread_line']) / 2
-        home_view['is_home'] = True
-        home_view['spread_display'] = home_view['spread_line'].apply(lambda x: f"{x*-1:+.1f}")
+        aggression_stats = team_features_at(team_features, max_wk, 'aggression_pct')
+        off_share = team_features_at(team_features, max_wk, 'off_share')
+        def_share = team_features_at(team_features, max_wk, 'def_share', key='opponent')
 
-        away_view = matchups[['away_team', 'home_team', 'roof', 'game_dt', 'total_line', 'spread_line']].copy()
-        away_view['home_field'] = away_view['home_team']
-        away_view = away_view.rename(columns={'away_team': 'team', 'home_team': 'opponent'})
-        away_view['vegas_implied'] = (away_view['total_line'] - away_view['spread_line']) / 2
-        away_view['is_home'] = False
-        away_view['spread_display'] = away_view['spread_line'].apply(lambda x: f"{x:+.1f}")
-        
-        model = pd.concat([home_view, away_view])
-        model['is_dome'] = model['roof'].isin(['dome', 'closed'])
+        model = build_matchup_rows(schedule, [target_week]).drop(columns=['week'])
         
         print("🌤️ Fetching Weather...")
-        model['weather_data'] = model.apply(lambda x: get_weather_forecast(x['home_field'], x['game_dt'], x['is_dome']), axis=1)
+        # One lookup per game (home & away views share it); stadium forecasts are memoized in engine/weather.py
+        reset_weather_cache()
+        games_wx = model[['home_field', 'game_dt', 'is_dome']].drop_duplicates(subset=['home_field', 'game_dt']).copy()
+        get_weekly_forecasts(games_wx)
+        games_wx['weather_data'] = [get_weather_forecast(h, dt, d) for h, dt, d in zip(games_wx['home_field'], games_wx['game_dt'], games_wx['is_dome'])]
+        model = pd.merge(model, games_wx[['home_field', 'game_dt', 'weather_data']], on=['home_field', 'game_dt'], how='left')
         model['wind'] = model['weather_data'].apply(lambda x: x[0])
         model['weather_desc'] = model['weather_data'].apply(lambda x: x[1])
 
         # --- CURRENT WEEK LIVE SCORING ---
-        current_week_pbp = kick_plays[kick_plays['week'] == target_week].copy()
+        current_week_pbp = kick_plays[kick_plays['week'] == target_week]
         live_cols = [
-            'wk_fg_0_19', 'wk_fg_20_29', 'wk_fg_30_39', 'wk_fg_40_49', 'wk_fg_50_59', 'wk_fg_60_plus', 
-            'wk_fg_miss', 'wk_xp_made', 'wk_xp_miss',
-            'wk_fg_miss_0_19', 'wk_fg_miss_20_29', 'wk_fg_miss_30_39', 'wk_fg_miss_40_49',
-            'wk_fg_miss_50_59', 'wk_fg_miss_60_plus'
+            'fg_0_19', 'fg_20_29', 'fg_30_39', 'fg_40_49', 'fg_50_59', 'fg_60_plus', 
+            'fg_miss', 'xp_made', 'xp_miss',
+            'fg_miss_0_19', 'fg_miss_20_29', 'fg_miss_30_39', 'fg_miss_40_49',
+            'fg_miss_50_59', 'fg_miss_60_plus'
         ]
         
         if not current_week_pbp.empty:
-            live_stats = current_week_pbp.groupby('kicker_player_id').agg(
-                wk_fg_0_19=('fg_0_19', 'sum'),
-                wk_fg_20_29=('fg_20_29', 'sum'),
-                wk_fg_30_39=('fg_30_39', 'sum'),
-                wk_fg_40_49=('fg_40_49', 'sum'),
-                wk_fg_50_59=('fg_50_59', 'sum'),
-                wk_fg_60_plus=('fg_60_plus', 'sum'),
-                wk_fg_miss=('fg_miss', 'sum'),
-                wk_xp_made=('xp_made', 'sum'),
-                wk_xp_miss=('xp_miss', 'sum'),
-                wk_fg_miss_0_19=('fg_miss_0_19', 'sum'),
-                wk_fg_miss_20_29=('fg_miss_20_29', 'sum'),
-                wk_fg_miss_30_39=('fg_miss_30_39', 'sum'),
-                wk_fg_miss_40_49=('fg_miss_40_49', 'sum'),
-                wk_fg_miss_50_59=('fg_miss_50_59', 'sum'),
-                wk_fg_miss_60_plus=('fg_miss_60_plus', 'sum')
-            ).reset_index()
+            live_stats = aggregate_kick_counts(current_week_pbp, ['kicker_player_id'], live_cols, prefix='wk_')
         else:
-            live_stats = pd.DataFrame(columns=['kicker_player_id'] + live_cols)
+            live_stats = pd.DataFrame(columns=['kicker_player_id'] + [f'wk_{c}' for c in live_cols])
+
+        live_points = score_presets(live_stats, prefix='wk_')
+        for name, points in distance_points.items():
+            live_points[name] = points_by_kicker(distance_store, points, live_stats['kicker_player_id'], weeks=[target_week])
 
         # --- MERGE EVERYTHING ---
         final = pd.merge(stats, model, on='team', how='inner')
@@ -370,7 +283,10 @@ def run_analysis():
         final = final.drop_duplicates(subset=['kicker_player_id'])
         final = final.fillna(0)
 
-        history_data = analyze_past_3_weeks_strict(target_week, pbp, schedule, stats)
+        # Point-in-time replay of the real model for every past week (features as of kickoff)
+        replayed = replay_projections(kick_plays, schedule, team_features, range(2, target_week))
+        history = apply_projections(history, replayed)
+        history_data = analyze_past_3_weeks_strict(target_week, pbp, schedule, stats, projections=replayed)
         
         # --- INJECT PROJECTIONS INTO HISTORY ---
         for pid, h_data in history_data.items():
@@ -384,70 +300,12 @@ def run_analysis():
                             record['proj'] = proj
                             break
 
-        def process_row(row):
-            injury_status = row.get('injury_status', 'Healthy')
-            if injury_status in ['OUT', 'CUT', 'Practice Squad', 'IR', 'Inactive']:
-                proj = 0.0
-                grade = 0.0
-                off_score = 0.0
-                def_score = 0.0
-                off_cap = 0.0
-                def_cap = 0.0
-                w_team_score = 0.0
-                w_def_allowed = 0.0
-                bonuses = [f"⛔ {injury_status}"]
-                base_proj = 0.0
-            else:
-                off_score = (row['off_stall_rate'] / lg_off_avg * 40) if lg_off_avg else 40
-                def_score = (row['def_stall_rate'] / lg_def_avg * 40) if lg_def_avg else 40
-                bonus_val = 0
-                bonuses = []
-                if row['is_dome']: 
-                    bonus_val += 10
-                    bonuses.append("+10 Dome")
-                    
-                grade = round(off_score + def_score + bonus_val, 1)
-                base_proj = row['avg_pts'] * (grade / 90)
-                
-                # RESTORED WEIGHTED MATH
-                w_team_score = (row['vegas_implied'] * 0.7) + (row['off_ppg'] * 0.3) if row['vegas_implied'] > 0 else row['off_ppg']
-                w_def_allowed = (row['vegas_implied'] * 0.7) + (row['def_pa'] * 0.3) if row['vegas_implied'] > 0 else row['def_pa']
-                
-                s_off_val = row.get('off_share', 0.45)
-                s_off = min(s_off_val if s_off_val > 0 else 0.45, 0.80)
-                off_cap = w_team_score * (s_off * 1.2)
-                
-                d_share_val = row.get('def_share', 0.45)
-                s_def = min(d_share_val if d_share_val > 0 else 0.45, 0.80)
-                def_cap = w_def_allowed * (s_def * 1.2)
-                
-                weighted_proj = (base_proj * 0.50) + (off_cap * 0.30) + (def_cap * 0.20)
-                proj = round(weighted_proj, 1) if weighted_proj > 1.0 else round(base_proj, 1)
-            
-            history_obj = history_data.get(row['kicker_player_id'], {'l3_actual': 0, 'l3_proj': 0, 'l3_games': []})
-
-            return pd.Series({
-                'grade': grade,
-                'proj': proj,
-                'grade_details': bonuses,
-                'off_score_val': round(off_score, 1),
-                'def_score_val': round(def_score, 1),
-                'w_team_score': round(w_team_score, 1), 
-                'w_def_allowed': round(w_def_allowed, 1),
-                'off_cap_val': round(off_cap, 1),
-                'def_cap_val': round(def_cap, 1),
-                'details_vegas_total': round(row['total_line'], 1),
-                'details_vegas_spread': row['spread_display'],
-                'history': history_obj,
-                # EXCLUDE live cols from return
-            })
-
-        final = final.join(final.apply(process_row, axis=1))
+        final = final.join(project_kickers(final, lg_off_avg, lg_def_avg))
+        empty_history = {'l3_actual': 0, 'l3_proj': 0, 'l3_games': []}
+        final['history'] = [history_data.get(pid, empty_history) for pid in final['kicker_player_id']]
         final = final.sort_values('proj', ascending=False)
-        final['narrative'] = final.apply(generate_narrative, axis=1)
+        final['narrative'] = final.apply(generate_narrative, axis=1, week=target_week)
         
-        final = final.replace([np.inf, -np.inf, np.nan], None)
-        final = final.where(pd.notnull(final), None)
         ytd_sorted = stats.sort_values('fpts', ascending=False).replace([np.inf, -np.inf, np.nan], None)
         ytd_sorted = ytd_sorted.where(pd.notnull(ytd_sorted), None)
         injuries_list = stats[stats['injury_status'] != 'Healthy'].sort_values('fpts', ascending=False).replace([np.inf, -np.inf, np.nan], None)
@@ -457,7 +315,6 @@ def run_analysis():
         output_main = {
             "meta": {
                 "week": int(target_week),
-                "updated": datetime.now().strftime("%Y-%m-%d %H:%M"),
                 "league_avgs": {
                     "fpts": clean_nan(round(stats['fpts'].mean(), 1)),
                     "off_stall": clean_nan(round(lg_off_avg, 1)),
@@ -466,31 +323,35 @@ def run_analysis():
                     "l4_def_pa": clean_nan(round(def_pa['def_pa'].mean(), 1) if not def_pa.empty else 0)
                 }
             },
-            "rankings": final.to_dict(orient='records'),
+            "presets": {
+                "names": PRESET_NAMES,
+                "ytd": ytd_presets,
+                "week": preset_arrays(live_stats['kicker_player_id'], live_points)
+            },
+            "rankings": records_from_columns(final),
             "ytd": ytd_sorted.to_dict(orient='records'),
             "injuries": injuries_list.to_dict(orient='records')
         }
 
-        # OUTPUT 2: History Data
-        output_history = {
-            "history": history
-        }
-
-        # OUTPUT 3: Teams Data
+        # OUTPUT 2: Teams Data
         output_teams = {
             "team_history": team_history 
         }
         
-        with open("public/kicker_data.json", "w") as f:
-            json.dump(output_main, f, indent=2)
-            
-        with open("public/history_data.json", "w") as f:
-            json.dump(output_history, f, indent=2)
-            
-        with open("public/teams_data.json", "w") as f:
-            json.dump(output_teams, f, indent=2)
+        artifact_sizes = {
+            name: write_json_artifact(f"public/{name}", payload)
+            for name, payload in [("kicker_data.json", output_main), ("teams_data.json", output_teams)]
+        }
+        # History goes out as week/kicker shards; only shards whose content changed are rewritten
+        write_history_shards(history)
+        # Committed with the data so payload size is tracked run over run
+        write_json_if_changed("public/artifact_sizes.json", artifact_sizes)
+
+        # The only per-run value lives in its own tiny file so unchanged data leaves the artifacts byte-identical
+        with open("public/status.json", "w") as f:
+            json.dump({"updated": datetime.now().strftime("%Y-%m-%d %H:%M"), "week": int(target_week)}, f)
         
-        print(f"✅ Success! All 3 Data Files saved.")
+        print(f"✅ Success! Data files and history shards saved.")
     
     except Exception as e:
         print(f"❌ Fatal Error: {e}")
@@ -0,0 +1,36 @@
+import argparse
+import os
+import sys
+import time
+
+from engine.config import CURRENT_SEASON, BACKFILL_DIR
+from engine.backfill import load_backfill
+from engine.tuning import weight_grid, evaluate_weights
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search projection blend weights against backfilled actuals.")
+    parser.add_argument("--start", type=int, default=2010)
+    parser.add_argument("--end", type=int, default=CURRENT_SEASON)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--out-dir", default=BACKFILL_DIR)
+    args = parser.parse_args()
+
+    replay = load_backfill(range(args.start, args.end + 1), args.out_dir)
+    if replay.empty:
+        print(f"❌ No backfill artifacts in {args.out_dir}. Run run_backfill.py first.")
+        sys.exit(1)
+
+    params = weight_grid()
+    print(f"🎛️ Evaluating {len(params['w_base'])} weight combinations on {replay['act'].notna().sum()} kicker-weeks...")
+    t0 = time.monotonic()
+    results = evaluate_weights(replay, params)
+    print(f"   ✅ Done in {time.monotonic() - t0:.1f}s")
+
+    current = results.loc[0]
+    print(f"\n📌 Current weights: MAE {current['mae']}, Spearman {current['spearman']}")
+    print(f"\n🏆 Top {args.top} by MAE:")
+    print(results.head(args.top).to_string(index=False))
+
+    path = os.path.join(args.out_dir, "weight_search.csv")
+    results.to_csv(path, index=False)
+    print(f"\n💾 Full results saved to {path}")
@@ -4,6 +4,7 @@ import { Trophy, TrendingUp, Activity, Stethoscope, BookOpen, Settings, AlertTri
 
 import { DEFAULT_SCORING } from './data/constants';
 import { calcFPts, calcProj, fetchSleeperScores } from './utils/scoring';
+import { decodeHistory } from './utils/history';
 import { HeaderCell, PlayerCell, DeepDiveRow, InjuryCard } from './components/KickerComponents';
 import AccuracyTab from './components/AccuracyTab';
 import SettingsTab from './components/SettingsTab';
@@ -49,12 +50,16 @@ const App = () => {
       };
       
       try {
-          const [main, history] = await Promise.all([
+          const [main, history, status] = await Promise.all([
               fetchJson('/kicker_data.json'),
-              fetchJson('/history_data.json').catch(() => ({ history: {} }))
+              fetchJson('/history/manifest.json')
+                  .then(manifest => ({ history: {}, manifest }))
+                  .catch(() => ({ history: {} })),
+              // The run timestamp is kept out of kicker_data.json so unchanged data stays byte-identical
+              fetchJson('/status.json').catch(() => ({}))
           ]);
           
-          setData(main);
+          setData({ ...main, meta: { ...main.meta, ...status } });
           setHistoryData(history);
       } catch (err) {
           console.error("Fetch Error:", err);
@@ -64,6 +69,22 @@ const App = () => {
       }
   }, []);
 
+  // History is sharded per week; shards are fetched when a week is first viewed
+  // and cache-busted by their content hash from the manifest.
+  const loadHistoryWeek = useCallback(async (week) => {
+      const key = String(week);
+      const entry = historyData?.manifest?.weeks?.[key];
+      if (!entry || historyData.history[key]) return;
+      try {
+          const res = await fetch(`/history/${key}.json?v=${entry.hash}`);
+          if (!res.ok) return;
+          const shard = decodeHistory(await res.json()).history;
+          setHistoryData(prev => ({ ...prev, history: { ...prev.history, ...shard } }));
+      } catch (e) {
+          console.error("History Fetch Error", e);
+      }
+  }, [historyData]);
+
   useEffect(() => {
     const savedScoring = localStorage.getItem('kicker_scoring');
     const savedLeagueId = localStorage.getItem('sleeper_league_id');
@@ -449,7 +470,7 @@ const App = () => {
           </div>
         )}
         
-        {activeTab === 'accuracy' && <AccuracyTab players={processed} scoring={scoring} week={meta.week} sleeperLeagueId={sleeperLeagueId} historyData={historyData} />}
+        {activeTab === 'accuracy' && <AccuracyTab players={processed} scoring={scoring} week={meta.week} sleeperLeagueId={sleeperLeagueId} historyData={historyData} loadHistoryWeek={loadHistoryWeek} />}
         
         {activeTab === 'ytd' && (
           <div className="bg-slate-900 rounded-xl border border-slate-800 overflow-hidden shadow-xl">
@@ -1,13 +1,18 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect } from 'react';
 import { PlayCircle, CheckCircle2, Clock, Calendar, Target, TrendingUp, Activity, ArrowUp, ArrowDown, Minus, Bot, BarChart3, Users, User, Flag, ChevronDown } from 'lucide-react';
 import { calculateLiveScore, getGameStatus } from '../utils/scoring';
 import { FootballIcon } from './KickerComponents';
 
-const AccuracyTab = ({ players, scoring, week, sleeperLeagueId, historyData }) => {
+const AccuracyTab = ({ players, scoring, week, sleeperLeagueId, historyData, loadHistoryWeek }) => {
   const [filter, setFilter] = useState('ALL');
   const [selectedWeek, setSelectedWeek] = useState(week);
   const [isDropdownOpen, setIsDropdownOpen] = useState(false);
 
+  // Past weeks come from per-week history shards, loaded on first view
+  useEffect(() => {
+      if (selectedWeek !== week && loadHistoryWeek) loadHistoryWeek(selectedWeek);
+  }, [selectedWeek, week, loadHistoryWeek]);
+
   // Helper to safely format numbers (handles 0/NaN/undefined input)
   const safeFmt = (n) => {
       const num = Number(n);
@@ -0,0 +1,22 @@
+// History shards (public/history/*.json) are columnar: a player dictionary, the count column
+// header and, per week, player indexes + a flat row-major count array (+ projections).
+// Expands a shard back to { history: { [week]: [{ id, name, fg_0_19, ..., proj }] } }.
+export const decodeHistory = (data) => {
+  if (!data || !data.weeks) return { history: {} };
+
+  const { ids, names } = data.players;
+  const columns = data.columns;
+  const width = columns.length;
+  const history = {};
+
+  Object.entries(data.weeks).forEach(([week, w]) => {
+    history[week] = w.players.map((p, i) => {
+      const record = { id: ids[p], name: names[p] };
+      columns.forEach((col, c) => { record[col] = w.counts[i * width + c]; });
+      if (w.proj && w.proj[i] !== null && w.proj[i] !== undefined) record.proj = w.proj[i];
+      return record;
+    });
+  });
+
+  return { history };
+};